@@ -0,0 +1,95 @@
+"""Import-time budget check for app.py and every page.
+
+Each script's top-level imports are collected with ``ast`` and executed in
+a fresh ``python -X importtime`` process after ``import streamlit`` (the
+Streamlit runtime has already paid for that). What remains is the cost a
+cold start or page switch adds on top of Streamlit.
+
+Usage:
+    python -m bench.importtime                 # exit 1 if a budget is exceeded
+    python -m bench.importtime --budget-ms 100 --top 8
+"""
+import argparse
+import ast
+import glob
+import os
+import re
+import subprocess
+import sys
+from typing import List, Tuple
+
+DEFAULT_BUDGET_MS = 150.0
+
+# Per-script overrides (milliseconds)
+BUDGETS_MS = {
+    "app.py": 20.0,
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S+)")
+
+
+def top_level_imports(path: str) -> List[str]:
+    """Import statements at module level of a script, as source lines."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    return [
+        ast.unparse(node)
+        for node in tree.body
+        if isinstance(node, (ast.Import, ast.ImportFrom))
+    ]
+
+
+def measure(imports: List[str]) -> Tuple[float, List[Tuple[str, float]]]:
+    """Incremental import cost after streamlit: (total ms, [(module, ms)])."""
+    code = "\n".join(["import streamlit"] + imports)
+    env = dict(os.environ, GROQ_API_KEY=os.environ.get("GROQ_API_KEY", "bench"))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    modules = []
+    after_streamlit = False
+    for line in proc.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        cumulative_us, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        if len(indent) != 1:
+            continue  # nested import, already counted in its parent
+        if not after_streamlit:
+            after_streamlit = name == "streamlit"
+            continue
+        modules.append((name, cumulative_us / 1000))
+    return sum(ms for _, ms in modules), sorted(modules, key=lambda m: -m[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check import-time budgets.")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=5, help="heaviest modules to list")
+    args = parser.parse_args()
+
+    failed = False
+    for path in ["app.py"] + sorted(glob.glob("pages/*.py")):
+        budget = BUDGETS_MS.get(path, args.budget_ms)
+        try:
+            total, modules = measure(top_level_imports(path))
+        except RuntimeError as e:
+            print(f"{path:<32} ERROR  {e}")
+            failed = True
+            continue
+        status = "ok" if total <= budget else "OVER"
+        failed = failed or total > budget
+        print(f"{path:<32} {total:>7.1f} ms / {budget:.0f} ms  {status}")
+        for name, ms in modules[: args.top]:
+            print(f"    {name:<28} {ms:>7.1f} ms")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
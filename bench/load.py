@@ -0,0 +1,216 @@
+"""Offline load test: N simulated users against the local mock server.
+
+Usage:
+    python -m bench.load --users 20 --requests 10
+    python -m bench.load --users 8 --scenarios pose_info,diet --stream --latency 1.5
+    python -m bench.load --users 4 --apptest        # full page renders via AppTest
+    python -m bench.load --rpm 6000 --tpm 1000000    # lift client-side rate limits
+
+Every run uses a fresh temporary CF_CACHE_DIR, so results do not depend on
+earlier runs; ``--inputs`` controls how many distinct queries users draw
+from (fewer inputs means more cache hits and coalesced calls). Pages read
+styles/ and images/ relative to the working directory, so run from the
+repository root.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List
+
+from bench import mock_server
+
+# AppTest resolves relative script paths against the calling file
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = ("pose_info", "pose_predictor", "diet", "video", "gif")
+PAGES = ("info", "yoga", "diet")
+
+_POSE_WORDS = ("Lotus", "Crane", "Wind", "Moon", "River", "Eagle", "Fire", "Bamboo")
+_PROBLEMS = ("lower back pain", "anxiety", "neck stiffness", "poor sleep", "tight hips", "stress")
+
+
+def _pose(i: int) -> str:
+    # Invented names miss the local catalog, so pages really call the LLM
+    return f"{_POSE_WORDS[i % len(_POSE_WORDS)]} Flow {i}"
+
+
+def _problem(i: int) -> str:
+    return f"{_PROBLEMS[i % len(_PROBLEMS)]} after {i % 7 + 1} hours of desk work"
+
+
+def _drain(stream) -> None:
+    for _ in stream:
+        pass
+
+
+def _diet_args(i: int) -> dict:
+    return dict(
+        age=18 + i % 50,
+        gender=("Male", "Female")[i % 2],
+        weight_kg=50.0 + (i * 3) % 60,
+        height_cm=150.0 + (i * 7) % 45,
+        goal=("weight loss", "muscle gain", "maintain")[i % 3],
+        diet_type=("vegetarian", "vegan", "non-vegetarian")[i % 3],
+    )
+
+
+def _function_calls(stream: bool) -> Dict[str, Callable[[int], None]]:
+    from utils import ollama_client
+    from utils.media import fetch_gif_ddg, fetch_video_ddg
+
+    if stream:
+        return {
+            "pose_info": lambda i: _drain(ollama_client.get_pose_info_stream(_pose(i))),
+            "pose_predictor": lambda i: _drain(ollama_client.pose_predictor_stream(_problem(i))),
+            "diet": lambda i: _drain(ollama_client.generate_diet_plan_stream(**_diet_args(i))),
+            "video": lambda i: fetch_video_ddg(_pose(i)),
+            "gif": lambda i: fetch_gif_ddg(_pose(i)),
+        }
+    return {
+        "pose_info": lambda i: ollama_client.get_pose_info(_pose(i)),
+        "pose_predictor": lambda i: ollama_client.recommend_poses(_problem(i)),
+        "diet": lambda i: ollama_client.generate_diet_plan(**_diet_args(i)),
+        "video": lambda i: fetch_video_ddg(_pose(i)),
+        "gif": lambda i: fetch_gif_ddg(_pose(i)),
+    }
+
+
+def _page_renders() -> Dict[str, Callable[[int], None]]:
+    from streamlit.testing.v1 import AppTest
+
+    def _render(path: str, fill: Callable) -> Callable[[int], None]:
+        def run(i: int) -> None:
+            at = AppTest.from_file(os.path.join(ROOT, path), default_timeout=120)
+            at.run()
+            fill(at, i)
+            at.button[0].click().run()
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+
+        return run
+
+    return {
+        "info": _render("pages/info.py", lambda at, i: at.text_input[0].input(_pose(i))),
+        "yoga": _render("pages/yoga_recommendation.py", lambda at, i: at.text_input[0].input(_problem(i))),
+        "diet": _render("pages/Diet.py", lambda at, i: at.number_input[0].set_value(18 + i % 50)),
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an unsorted list."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def run_load(
+    calls: Dict[str, Callable[[int], None]],
+    users: int,
+    requests_per_user: int,
+    inputs: int,
+    seed: int = 0,
+) -> dict:
+    """Run every user on its own thread; returns per-scenario latencies and errors."""
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lock = threading.Lock()
+    names = list(calls)
+    start_gate = threading.Event()
+
+    def user(uid: int) -> None:
+        rng = random.Random(seed * 1000 + uid)
+        start_gate.wait()
+        for n in range(requests_per_user):
+            name = names[(uid + n) % len(names)]
+            started = time.perf_counter()
+            failed = False
+            try:
+                calls[name](rng.randrange(inputs))
+            except Exception:
+                failed = True
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies[name].append(elapsed)
+                if failed:
+                    errors[name] += 1
+
+    threads = [threading.Thread(target=user, args=(u,), daemon=True) for u in range(users)]
+    for t in threads:
+        t.start()
+    wall = time.perf_counter()
+    start_gate.set()
+    for t in threads:
+        t.join()
+    return {"wall": time.perf_counter() - wall, "latencies": latencies, "errors": errors}
+
+
+def report(result: dict) -> str:
+    lines = [
+        f"{'scenario':<16}{'n':>6}{'err':>6}{'rps':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    ]
+    wall = result["wall"]
+    total = 0
+    for name, values in sorted(result["latencies"].items()):
+        total += len(values)
+        lines.append(
+            f"{name:<16}{len(values):>6}{result['errors'][name]:>6}{len(values) / wall:>8.1f}"
+            + "".join(f"{percentile(values, q) * 1000:>10.0f}" for q in (0.5, 0.95, 0.99))
+        )
+    lines.append(f"total {total} calls in {wall:.1f}s = {total / wall:.1f} req/s")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the app against a local mock.")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=10, help="calls per user")
+    parser.add_argument("--inputs", type=int, default=50, help="distinct queries to draw from")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--stream", action="store_true", help="use the streaming entry points")
+    parser.add_argument("--apptest", action="store_true", help="render full pages with AppTest")
+    parser.add_argument("--pages", default=",".join(PAGES), help="pages for --apptest")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rpm", type=float, help="client rate limit, requests/min (default: app setting)")
+    parser.add_argument("--tpm", type=float, help="client rate limit, tokens/min (default: app setting)")
+    mock_server.add_arguments(parser)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    server, base = mock_server.start(mock_server.config_from_args(args))
+
+    # Must be set before utils is imported: modules read them at import time
+    os.environ["CF_CACHE_DIR"] = tempfile.mkdtemp(prefix="cf-bench-")
+    os.environ["GROQ_BASE_URL"] = f"{base}/v1/chat/completions"
+    os.environ["OLLAMA_BASE_URL"] = f"{base}/v1/chat/completions"
+    os.environ["CF_MEDIA_SEARCH_URL"] = f"{base}/search"
+    os.environ.setdefault("GROQ_API_KEY", "bench")
+    if args.rpm:
+        os.environ["CF_GROQ_RPM"] = str(args.rpm)
+    if args.tpm:
+        os.environ["CF_GROQ_TPM"] = str(args.tpm)
+
+    if args.apptest:
+        selected = args.pages.split(",")
+        calls = {f"page:{k}": v for k, v in _page_renders().items() if k in selected}
+    else:
+        selected = args.scenarios.split(",")
+        calls = {k: v for k, v in _function_calls(args.stream).items() if k in selected}
+    if not calls:
+        sys.exit("No scenarios selected.")
+
+    result = run_load(calls, args.users, args.requests, args.inputs, args.seed)
+    print(report(result))
+
+    from utils import ollama_client
+
+    print(f"llm cache: {ollama_client.cache_stats()}")
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
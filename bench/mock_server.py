@@ -0,0 +1,230 @@
+"""Local stand-in for the Groq chat-completions API and DuckDuckGo search.
+
+Endpoints:
+    POST /v1/chat/completions   OpenAI-style, JSON or SSE (``"stream": true``)
+    GET  /search/videos?q=...   DDG-shaped video results
+    GET  /search/images?q=...   DDG-shaped image results
+
+Usage:
+    python -m bench.mock_server --port 8088 --latency 0.8 --error-rate 0.05
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Tuple
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class MockConfig:
+    latency: float = 0.5  # seconds before the first byte of an LLM reply
+    jitter: float = 0.2  # +/- uniform jitter on every latency
+    error_rate: float = 0.0  # share of LLM requests answered with 503
+    rate_limit_rate: float = 0.0  # share answered with 429 + Retry-After
+    tokens: int = 200  # approximate completion length
+    token_delay: float = 0.01  # seconds between streamed chunks
+    search_latency: float = 0.3
+    search_error_rate: float = 0.0
+
+
+_WORDS = (
+    "breathe deeply and lengthen the spine while keeping the shoulders relaxed "
+    "press evenly through both hands and feet to find a steady calm posture"
+).split()
+
+
+def _sleep(seconds: float, jitter: float) -> None:
+    time.sleep(max(0.0, seconds + random.uniform(-jitter, jitter)))
+
+
+def _markdown(tokens: int) -> str:
+    words = [random.choice(_WORDS) for _ in range(tokens)]
+    lines = ["**Key Benefits**:"]
+    for i in range(0, len(words), 12):
+        lines.append("- " + " ".join(words[i:i + 12]))
+    lines.append("**Duration**: 30-60 seconds")
+    return "\n".join(lines)
+
+
+def _json_poses() -> str:
+    poses = [
+        {
+            "name": name,
+            "sanskrit": sanskrit,
+            "benefits": "Eases tension and calms the mind.",
+            "steps": ["Start on the mat.", "Move into the pose.", "Breathe slowly."],
+            "duration": "30-60 seconds",
+        }
+        for name, sanskrit in random.sample(
+            [
+                ("Child's Pose", "Balasana"),
+                ("Cat-Cow Pose", "Marjaryasana-Bitilasana"),
+                ("Cobra Pose", "Bhujangasana"),
+                ("Bridge Pose", "Setu Bandhasana"),
+                ("Legs Up the Wall", "Viparita Karani"),
+            ],
+            3,
+        )
+    ]
+    return json.dumps({"poses": poses})
+
+
+def _usage(content: str) -> dict:
+    completion = max(1, len(content) // 4)
+    return {"prompt_tokens": 60, "completion_tokens": completion, "total_tokens": 60 + completion}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config = MockConfig()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, body: dict, headers: dict = None) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "not found"}})
+            return
+
+        cfg = self.config
+        roll = random.random()
+        if roll < cfg.rate_limit_rate:
+            self._send_json(429, {"error": {"message": "rate limited"}}, {"Retry-After": "1"})
+            return
+        if roll < cfg.rate_limit_rate + cfg.error_rate:
+            _sleep(cfg.latency, cfg.jitter)
+            self._send_json(503, {"error": {"message": "overloaded"}})
+            return
+
+        if (payload.get("response_format") or {}).get("type") == "json_object":
+            content = _json_poses()
+        else:
+            content = _markdown(min(cfg.tokens, payload.get("max_tokens") or cfg.tokens))
+
+        _sleep(cfg.latency, cfg.jitter)
+        if payload.get("stream"):
+            self._stream(payload, content)
+        else:
+            self._send_json(
+                200,
+                {
+                    "model": payload.get("model"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}],
+                    "usage": _usage(content),
+                },
+            )
+
+    def _stream(self, payload: dict, content: str) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        pieces = content.split(" ")
+        for i, piece in enumerate(pieces):
+            text = piece if i == len(pieces) - 1 else piece + " "
+            chunk = {"choices": [{"index": 0, "delta": {"content": text}}]}
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            time.sleep(self.config.token_delay)
+        final = {"choices": [], "x_groq": {"usage": _usage(content)}}
+        self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        kind = url.path.rstrip("/").rsplit("/", 1)[-1]
+        if kind not in ("videos", "images"):
+            self._send_json(404, {"error": "not found"})
+            return
+
+        cfg = self.config
+        _sleep(cfg.search_latency, cfg.jitter)
+        if random.random() < cfg.search_error_rate:
+            self._send_json(403, {"error": "ratelimit"})
+            return
+
+        query = parse_qs(url.query).get("q", [""])[0]
+        count = int(parse_qs(url.query).get("max_results", ["3"])[0])
+        slug = "-".join(query.lower().split())
+        if kind == "videos":
+            results = [
+                {"title": query, "content": f"https://example.com/video/{slug}-{i}.mp4"}
+                for i in range(count)
+            ]
+        else:
+            results = [
+                {"title": f"{query} gif", "image": f"https://example.com/img/{slug}-{i}.gif"}
+                for i in range(count)
+            ]
+        self._send_json(200, {"results": results})
+
+
+def start(config: MockConfig, host: str = "127.0.0.1", port: int = 0) -> Tuple[ThreadingHTTPServer, str]:
+    """Serve the mock on a daemon thread; returns the server and its base URL."""
+    handler = type("Handler", (_Handler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="mock-groq").start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency", type=float, default=MockConfig.latency)
+    parser.add_argument("--jitter", type=float, default=MockConfig.jitter)
+    parser.add_argument("--error-rate", type=float, default=MockConfig.error_rate)
+    parser.add_argument("--rate-limit-rate", type=float, default=MockConfig.rate_limit_rate)
+    parser.add_argument("--tokens", type=int, default=MockConfig.tokens)
+    parser.add_argument("--token-delay", type=float, default=MockConfig.token_delay)
+    parser.add_argument("--search-latency", type=float, default=MockConfig.search_latency)
+    parser.add_argument("--search-error-rate", type=float, default=MockConfig.search_error_rate)
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        tokens=args.tokens,
+        token_delay=args.token_delay,
+        search_latency=args.search_latency,
+        search_error_rate=args.search_error_rate,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock Groq + DuckDuckGo server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8088)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server, base = start(config_from_args(args), args.host, args.port)
+    print(f"GROQ_BASE_URL={base}/v1/chat/completions")
+    print(f"CF_MEDIA_SEARCH_URL={base}/search")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,101 +1,18 @@
 import streamlit as st
-from utils.ollama_client import generate_diet_plan
+from utils.ollama_client import generate_diet_plan_stream
+from utils import assets, theme
+from utils.deadline import deadline
 
-# ---------- Custom CSS ----------
-st.markdown(
-    """
-    <style>
-    /* Page background and font */
-    .stApp {
-        background: linear-gradient(135deg, #0f172a 0%, #020617 60%, #0f766e 100%);
-        color: #e5e7eb;
-        font-family: "Segoe UI", system-ui, -apple-system, BlinkMacSystemFont, sans-serif;
-    }
-
-    /* Center main content */
-    .main > div {
-        max-width: 800px;
-        margin: 0 auto;
-        padding-top: 1rem;
-    }
-
-    /* Title styling */
-    .diet-title {
-        text-align: center;
-        font-size: 2.2rem;
-        font-weight: 700;
-        margin-bottom: 0.2rem;
-        color: #fbbf24;
-        text-shadow: 0 0 18px rgba(251,191,36,0.45);
-    }
-
-    .diet-subtitle {
-        text-align: center;
-        font-size: 0.95rem;
-        color: #cbd5f5;
-        margin-bottom: 1.5rem;
-    }
-
-    /* Card for form */
-    .diet-card {
-        background: rgba(15,23,42,0.92);
-        border-radius: 18px;
-        padding: 1.2rem 1.4rem 1.4rem 1.4rem;
-        box-shadow: 0 18px 45px rgba(0,0,0,0.6);
-        border: 1px solid rgba(148,163,184,0.35);
-        backdrop-filter: blur(16px);
-    }
+# The plan is local; only the AI notes may use up this budget
+NOTES_BUDGET = 12
 
-    .diet-section-title {
-        font-size: 1.05rem;
-        font-weight: 600;
-        margin-bottom: 0.2rem;
-        color: #e5e7eb;
-    }
-
-    .diet-section-caption {
-        font-size: 0.8rem;
-        color: #9ca3af;
-        margin-bottom: 0.8rem;
-    }
-
-    /* Tweak default Streamlit widgets */
-    div[data-baseweb="input"] input,
-    div[data-baseweb="select"] select {
-        background-color: #020617 !important;
-        color: #e5e7eb !important;
-    }
-
-    .stButton>button {
-        width: 100%;
-        border-radius: 999px;
-        background: linear-gradient(90deg, #22c55e, #16a34a);
-        color: #0b1120;
-        border: none;
-        font-weight: 600;
-        padding: 0.6rem 0;
-        box-shadow: 0 12px 25px rgba(34,197,94,0.4);
-    }
-    .stButton>button:hover {
-        background: linear-gradient(90deg, #4ade80, #22c55e);
-    }
-
-    .diet-output {
-        margin-top: 1.5rem;
-        padding: 1.2rem 1.4rem;
-        border-radius: 14px;
-        background: rgba(15,23,42,0.9);
-        border: 1px solid rgba(148,163,184,0.4);
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+# ---------- Custom CSS ----------
+theme.inject("diet")
 
 # ---------- Header ----------
 col_logo, col_title = st.columns([1, 4])
 with col_logo:
-    st.image("images/image.png", width=70)
+    st.image(assets.logo(70) or assets.LOGO_PATH, width=70)
 with col_title:
     st.markdown('<div class="diet-title">AI Diet Plan Maker</div>', unsafe_allow_html=True)
     st.markdown(
@@ -124,6 +41,7 @@ with col5:
 
 goal = st.text_input("Goal (e.g. weight loss, muscle gain)", "weight loss")
 diet_type = st.selectbox("Diet type", ["vegetarian", "vegan", "non-vegetarian"])
+use_ai = st.checkbox("Add AI-written tips", value=True, help="The plan itself is computed locally; AI only writes the daily notes.")
 
 generate_clicked = st.button("Generate Diet Plan")
 
@@ -131,19 +49,22 @@ st.markdown("</div>", unsafe_allow_html=True)  # close diet-card
 
 # ---------- Output ----------
 if generate_clicked:
-    with st.spinner("Talking to AI, please wait..."):
-        try:
-            plan = generate_diet_plan(
-                age=int(age),
-                gender=gender,
-                weight_kg=float(weight),
-                height_cm=float(height),
-                goal=goal,
-                diet_type=diet_type,
-                activity_level=activity
+    try:
+        st.markdown('<div class="diet-output">', unsafe_allow_html=True)
+        # Render the plan progressively as tokens stream in
+        with deadline(NOTES_BUDGET):
+            plan = st.write_stream(
+                generate_diet_plan_stream(
+                    age=int(age),
+                    gender=gender,
+                    weight_kg=float(weight),
+                    height_cm=float(height),
+                    goal=goal,
+                    diet_type=diet_type,
+                    activity_level=activity,
+                    use_ai=use_ai,
+                )
             )
-            st.markdown('<div class="diet-output">', unsafe_allow_html=True)
-            st.markdown(plan)
-            st.markdown('</div>', unsafe_allow_html=True)
-        except Exception as e:
-            st.error(f"Error generating plan: {e}")
+        st.markdown('</div>', unsafe_allow_html=True)
+    except Exception as e:
+        st.error(f"Error generating plan: {e}")
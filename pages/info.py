@@ -1,46 +1,9 @@
 import streamlit as st
-from utils.ollama_client import get_pose_info
-from duckduckgo_search import DDGS
-
-
-# -------------------------------
-# DuckDuckGo video helper
-# -------------------------------
-@st.cache_data(show_spinner=False, ttl=60 * 60)
-def fetch_video_ddg(name: str):
-    """
-    Fetch a yoga pose video URL for the given asana name using DuckDuckGo.
-    Returns a single HTTPS video URL or None.
-    """
-    query = f"{name} yoga pose"
-    try:
-        results = list(
-            DDGS().videos(
-                keywords=query,
-                region="in-en",
-                safesearch="moderate",
-                timelimit=None,
-                max_results=5,
-            )
-        )
-    except Exception:
-        return None
-
-    if not results:
-        return None
-
-    # Prefer the actual video URL from 'content' / 'href', fallback to thumbnail
-    for r in results:
-        url = r.get("content") or r.get("href") or r.get("thumbnail")
-        if not url:
-            continue
-        if not url.startswith("http"):
-            continue
-        if "base64," in url:
-            continue
-        return url
-
-    return None
+from utils.ollama_client import get_pose_info_stream
+from utils import insight_store, pose_catalog, pose_resolver, session, theme
+from utils.deadline import deadline
+from utils.media import fetch_video_ddg
+from utils.pool import get_executor
 
 
 # -------------------------------
@@ -51,67 +14,20 @@ def get_pose_fallback_info(pose_name: str) -> str:
     Fallback pose information when Ollama is unavailable.
     Returns structured HTML content.
     """
-    pose_data = {
-        "downwarddog": {
-            "title": "Adho Mukha Svanasana (Downward Dog)",
-            "benefits": "Strengthens arms and legs, stretches hamstrings, calves, and back, and calms the mind.",
-            "level": "Beginner–Intermediate",
-            "duration": "30–60 seconds",
-        },
-        "warriori": {
-            "title": "Virabhadrasana I (Warrior I)",
-            "benefits": "Strengthens legs, opens hips and chest, and improves focus and stamina.",
-            "level": "Beginner",
-            "duration": "20–40 seconds per side",
-        },
-        "treepose": {
-            "title": "Vrikshasana (Tree Pose)",
-            "benefits": "Improves balance and concentration, strengthens ankles and inner thighs.",
-            "level": "Beginner",
-            "duration": "20–45 seconds per side",
-        },
-        "childspose": {
-            "title": "Balasana (Child's Pose)",
-            "benefits": "Relieves back and neck tension and calms the nervous system.",
-            "level": "Beginner",
-            "duration": "1–3 minutes",
-        },
-        "tadasana": {
-            "title": "Tadasana (Mountain Pose)",
-            "benefits": "Improves posture and body awareness and acts as a foundation for standing poses.",
-            "level": "Beginner",
-            "duration": "30–60 seconds",
-        },
-        "savasana": {
-            "title": "Savasana (Corpse Pose)",
-            "benefits": "Provides deep relaxation and stress relief and integrates the practice.",
-            "level": "All levels",
-            "duration": "5–10 minutes",
-        },
-    }
-
-    normalized = (
-        pose_name.lower()
-        .strip()
-        .replace("’", "")
-        .replace("'", "")
-        .replace("-", "")
-        .replace(" ", "")
-    )
+    data = pose_catalog.lookup(pose_name)
 
-    if normalized in pose_data:
-        data = pose_data[normalized]
+    if data is not None:
         return f"""
         <div style="font-size: 1.05rem; line-height: 1.6;">
             <div style="font-weight: 700; color: #1e40af; font-size: 1.15rem; margin-bottom: 0.8rem;">
-                {data['title']}
+                {data.title}
             </div>
             <div style="margin-bottom: 1rem; color: #0f172a;">
-                <strong>✨ Key Benefits:</strong> {data['benefits']}
+                <strong>✨ Key Benefits:</strong> {data.benefits}
             </div>
             <div style="display: flex; gap: 1.5rem; font-size: 0.95rem; color: #475569;">
-                <div><strong>Level:</strong> {data['level']}</div>
-                <div><strong>Hold:</strong> {data['duration']}</div>
+                <div><strong>Level:</strong> {data.level}</div>
+                <div><strong>Hold:</strong> {data.duration}</div>
             </div>
             <div style="margin-top: 1.2rem; padding: 1rem; background: rgba(99, 102, 241, 0.08); border-radius: 12px; font-size: 0.92rem; color: #3730a3;">
                 💡 <strong>Tip:</strong> Breathe deeply and focus on alignment for maximum benefits.
@@ -134,6 +50,10 @@ def get_pose_fallback_info(pose_name: str) -> str:
     """
 
 
+# Past this many seconds the page shows the fallback instead of waiting
+INSIGHT_BUDGET = 20
+
+
 # -------------------------------
 # Page config
 # -------------------------------
@@ -148,257 +68,7 @@ st.set_page_config(
 # -------------------------------
 # Global CSS
 # -------------------------------
-st.markdown(
-    """
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-
-    html, body, [class*="css"] {
-        font-family: 'Inter', sans-serif !important;
-        color: #0f172a;
-    }
-
-    .main {
-        background: radial-gradient(circle at top left, #e0f2fe 0, transparent 40%),
-                    radial-gradient(circle at bottom right, #dcfce7 0, transparent 40%),
-                    #f1f5f9;
-        background-attachment: fixed;
-    }
-
-    .app-header {
-        max-width: 1100px;
-        margin: 2.5rem auto 1.5rem auto;
-        padding: 2.5rem 2rem;
-        border-radius: 24px;
-        background: linear-gradient(135deg, #4f46e5 0%, #7c3aed 50%, #ec4899 100%);
-        color: #f9fafb;
-        text-align: center;
-        position: relative;
-        overflow: hidden;
-        box-shadow: 0 18px 45px rgba(15, 23, 42, 0.35);
-    }
-
-    .app-header::before,
-    .app-header::after {
-        content: "";
-        position: absolute;
-        border-radius: 999px;
-        filter: blur(30px);
-        opacity: 0.6;
-    }
-
-    .app-header::before {
-        width: 220px;
-        height: 220px;
-        background: rgba(248, 250, 252, 0.18);
-        top: -80px;
-        left: -40px;
-    }
-
-    .app-header::after {
-        width: 260px;
-        height: 260px;
-        background: rgba(15, 23, 42, 0.18);
-        bottom: -100px;
-        right: -60px;
-    }
-
-    .h1-header {
-        position: relative;
-        font-size: clamp(2.4rem, 4vw, 3.3rem) !important;
-        font-weight: 800 !important;
-        letter-spacing: 0.03em;
-        margin: 0 0 0.75rem 0 !important;
-    }
-
-    .subtitle-header {
-        position: relative;
-        font-size: clamp(1.05rem, 2vw, 1.35rem) !important;
-        opacity: 0.95 !important;
-    }
-
-    .sidebar-custom {
-        background: rgba(255, 255, 255, 0.94);
-        backdrop-filter: blur(22px);
-        padding: 2.25rem 2rem 2.5rem 2rem;
-        border-radius: 22px;
-        margin: 1.75rem 1.25rem;
-        box-shadow: 0 18px 40px rgba(15, 23, 42, 0.10);
-        border: 1px solid rgba(148, 163, 184, 0.18);
-    }
-
-    .sidebar-title {
-        color: white !important;
-        font-size: 1.6rem !important;
-        font-weight: 700 !important;
-        margin-bottom: 1.3rem !important;
-        text-align: left;
-        display: flex;
-        align-items: center;
-        gap: 0.4rem;
-    }
-
-    .sidebar-title::before {
-        content: "🧘";
-        font-size: 1.4rem;
-    }
-
-    .sidebar-custom label {
-        font-weight: 500;
-        color: yellow !important;
-    }
-
-    .sidebar-custom input {
-        border-radius: 999px !important;
-    }
-
-    .main-content {
-        padding: 1.5rem 1.5rem 3.5rem 1.5rem;
-        max-width: 1200px;
-        margin: 0 auto;
-    }
-
-    .pose-title {
-        color: white !important;
-        font-size: clamp(2rem, 3vw, 2.6rem) !important;
-        font-weight: 800 !important;
-        margin: 0 0 2rem 0 !important;
-        text-align: left;
-        display: flex;
-        align-items: center;
-        gap: 0.75rem;
-    }
-
-    .pose-title::before {
-        content: "📿";
-        font-size: 1.6rem;
-    }
-
-    .pose-viewer {
-        display: grid;
-        grid-template-columns: minmax(0, 1.05fr) minmax(0, 0.95fr);
-        gap: 2.5rem;
-        align-items: flex-start;
-        margin-top: 1.25rem;
-    }
-
-    .video-status {
-        text-align: center;
-        padding: 2.5rem 2rem;
-        color: #64748b;
-        font-size: 1.05rem;
-    }
-
-    .no-video {
-        background: rgba(248, 250, 252, 0.92);
-        border-radius: 22px;
-        padding: 2.5rem 2rem;
-        border: 1px dashed rgba(148, 163, 184, 0.7);
-    }
-
-    .ai-insights {
-        background: linear-gradient(135deg, #ffffff 0%, #f9fafb 50%, #eff6ff 100%);
-        backdrop-filter: blur(28px);
-        padding: 2.5rem 2.3rem;
-        border-radius: 26px;
-        box-shadow: 0 18px 40px rgba(15, 23, 42, 0.18);
-        border: 1px solid rgba(129, 140, 248, 0.35);
-        position: relative;
-        overflow: hidden;
-    }
-
-    .ai-insights::before {
-        content: "";
-        position: absolute;
-        inset: 0;
-        background: radial-gradient(circle at top right, rgba(129, 140, 248, 0.18) 0, transparent 55%);
-        opacity: 0.8;
-        pointer-events: none;
-    }
-
-    .ai-insights > * {
-        position: relative;
-        z-index: 1;
-    }
-
-    .insights-title {
-        color: #4338ca !important;
-        font-size: 1.5rem !important;
-        font-weight: 700 !important;
-        margin-bottom: 1.3rem !important;
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-    }
-
-    .insights-title::before {
-        content: "✨";
-        font-size: 1.3rem;
-    }
-
-    .footer-bar {
-        text-align: center;
-        padding: 3rem 1.5rem 2.5rem 1.5rem;
-        color: #64748b;
-        font-size: 0.95rem;
-        background: rgba(255, 255, 255, 0.85);
-        border-top: 1px solid rgba(226, 232, 240, 0.9);
-        margin-top: 1.5rem;
-    }
-
-    .stSpinner > div {
-        border-top-color: #6366f1 !important;
-    }
-
-    .stButton>button, .stTextInput>div>div>input {
-        transition: box-shadow 0.18s ease, transform 0.12s ease, border-color 0.18s ease;
-    }
-
-    .stTextInput>div>div>input:focus {
-        border-color: #6366f1 !important;
-        box-shadow: 0 0 0 1px rgba(99, 102, 241, 0.35);
-    }
-
-    .stButton>button:hover {
-        transform: translateY(-1px);
-        box-shadow: 0 10px 20px rgba(15, 23, 42, 0.16);
-    }
-
-    @media (max-width: 1024px) {
-        .pose-viewer {
-            grid-template-columns: minmax(0, 1fr);
-            gap: 2rem;
-        }
-
-        .main-content {
-            padding: 1.5rem 1.1rem 3rem 1.1rem;
-        }
-
-        .app-header {
-            margin: 1.75rem 1rem 1.25rem 1rem;
-            padding: 2.2rem 1.6rem;
-        }
-    }
-
-    @media (max-width: 768px) {
-        .sidebar-custom {
-            margin: 1.25rem 0.9rem;
-            padding: 2rem 1.6rem;
-        }
-
-        .pose-title {
-            justify-content: center;
-            text-align: center;
-        }
-
-        .main-content {
-            padding: 1.25rem 0.9rem 2.5rem 0.9rem;
-        }
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
+theme.inject("info")
 
 
 # -------------------------------
@@ -422,17 +92,21 @@ with st.sidebar:
     st.markdown('<div class="sidebar-custom">', unsafe_allow_html=True)
     st.markdown('<h2 class="sidebar-title">Enter Asana</h2>', unsafe_allow_html=True)
 
-    asana_name = st.text_input(
-        "Asana name",
-        value="Downward Dog",
-        help="Type any yoga pose name, e.g. Tadasana, Savasana, etc.",
-    )
+    # Only a submitted form changes the query; other reruns reuse it
+    with st.form("asana_form"):
+        asana_name = st.text_input(
+            "Asana name",
+            value="Downward Dog",
+            help="Type any yoga pose name, e.g. Tadasana, Savasana, etc.",
+        )
+        st.form_submit_button("Explore pose", use_container_width=True)
 
     st.markdown("</div>", unsafe_allow_html=True)
 
 st.markdown("---")
 
-selected_pose = asana_name.strip()
+# Collapse spelling variants onto the canonical pose so caches are shared
+selected_pose = pose_resolver.canonical_name(asana_name)
 
 
 # -------------------------------
@@ -445,18 +119,36 @@ if selected_pose:
         unsafe_allow_html=True,
     )
 
+    # Results from an earlier rerun of this session for the same pose
+    remembered_video = session.recall("pose_video", selected_pose)
+    remembered_info = session.recall("pose_info", selected_pose)
+
+    # Start the video lookup right away; the insights render meanwhile
+    video_future = None
+    if remembered_video is None:
+        video_future = get_executor().submit(fetch_video_ddg, selected_pose)
+
     st.markdown('<div class="pose-viewer">', unsafe_allow_html=True)
     col1, col2 = st.columns([1.05, 0.95])
 
-    # LEFT: video
+    # LEFT: video (filled in as soon as the lookup resolves)
     with col1:
-        with st.spinner("🎬 Fetching pose video..."):
-            video_url = fetch_video_ddg(selected_pose)
+        video_slot = st.empty()
+        video_slot.info("🎬 Fetching pose video...")
+
+    video_shown = False
 
+    def show_video():
+        global video_shown
+        if video_future is None:
+            video_url = remembered_video
+        else:
+            video_url = video_future.result() or ""
+            session.remember("pose_video", selected_pose, video_url)
         if video_url:
-            st.video(video_url)
+            video_slot.video(video_url)
         else:
-            st.markdown(
+            video_slot.markdown(
                 """
                 <div class="video-status no-video">
                     <strong>Could not load a video for this pose.</strong><br>
@@ -465,6 +157,17 @@ if selected_pose:
                 """,
                 unsafe_allow_html=True,
             )
+        video_shown = True
+
+    if video_future is None:
+        show_video()
+
+    def with_video(stream):
+        """Pass the insight stream through, dropping in the video once ready."""
+        for chunk in stream:
+            if not video_shown and video_future.done():
+                show_video()
+            yield chunk
 
     # RIGHT: AI insights with Ollama + fallback
     with col2:
@@ -474,10 +177,26 @@ if selected_pose:
             unsafe_allow_html=True,
         )
 
+        catalog_pose = pose_resolver.resolve(selected_pose)
+        stored_info = insight_store.get_insight(selected_pose)
         try:
-            with st.spinner(f"🤖 Analyzing {selected_pose} with Ollama..."):
-                pose_info = get_pose_info(selected_pose)
-            st.markdown(pose_info, unsafe_allow_html=True)
+            if catalog_pose is not None:
+                # Known asana: served from the local catalog, no LLM call
+                pose_info = pose_catalog.to_markdown(catalog_pose)
+                st.markdown(pose_info)
+            elif stored_info is not None:
+                # Pre-generated by `python -m utils.prewarm`
+                pose_info = stored_info
+                st.markdown(pose_info)
+            elif remembered_info is not None:
+                pose_info = remembered_info
+                st.markdown(pose_info)
+            else:
+                # Stream tokens as they arrive instead of blocking on the full answer
+                with deadline(INSIGHT_BUDGET):
+                    pose_info = st.write_stream(with_video(get_pose_info_stream(selected_pose)))
+                if pose_info:
+                    session.remember("pose_info", selected_pose, pose_info)
         except Exception:
             st.warning(
                 "Ollama is not reachable right now. Showing basic pose information instead."
@@ -488,6 +207,9 @@ if selected_pose:
 
         st.markdown("</div>", unsafe_allow_html=True)
 
+    if not video_shown:
+        show_video()
+
     st.markdown("</div>", unsafe_allow_html=True)  # pose-viewer
     st.markdown("</div>", unsafe_allow_html=True)  # main-content
 
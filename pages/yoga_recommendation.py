@@ -1,51 +1,58 @@
 import streamlit as st
-from utils.ollama_client import pose_predictor  # Your existing function
-from duckduckgo_search import DDGS
-
-@st.cache_data(show_spinner=False, ttl=60*60)
-def fetch_gif_ddg(name: str):
-    """Fetch yoga pose GIF using DuckDuckGo."""
-    query = f"{name} yoga pose gif animation"
-    try:
-        with DDGS() as ddgs:
-            results = list(ddgs.images(query, max_results=3))
-            for r in results:
-                url = r.get("image")
-                if url and url.startswith("https") and (".gif" in url.lower() or "gif" in r.get("title", "").lower()):
-                    return url
-    except:
-        pass
-    return None
+from utils.ollama_client import recommend_poses
+from utils.recommendations import catalog_recommendations
+from utils.media import fetch_gif_ddg
+from utils.pool import get_executor
+from utils import pose_resolver, session
+from utils.deadline import deadline
+
+# Give up on the LLM after this many seconds rather than spin forever
+RECOMMEND_BUDGET = 20
+
 
 st.title("🧘 Conscious Flow AI Yoga Predictor")
 st.markdown("Describe your issues (e.g., back pain, stress, neck stiffness) for personalized pose recommendations.")
 
-problem = st.text_input("Enter your problems...", placeholder="e.g., lower back pain and anxiety")
+# Only a submitted form changes the query; other reruns reuse it
+with st.form("problem_form"):
+    problem = st.text_input("Enter your problems...", placeholder="e.g., lower back pain and anxiety")
+    st.form_submit_button("Get recommendations")
+
+problem = " ".join(problem.split())
 
 if problem:
-    with st.spinner("AI is recommending poses..."):
-        # Call your pose_predictor - enhance it with this prompt if needed
-        response = pose_predictor(f"""
-        User problems: {problem}
-        Recommend 2-3 beginner-friendly yoga poses. For each:
-        - English & Sanskrit name
-        - Key benefits for these issues
-        - Step-by-step instructions (3-5 steps)
-        - Duration: 30-60 seconds
-        Format as bullet list: **Pose Name**: \n
-        Benefits. \n
-        Steps: 1....
-        """)
-    
     st.markdown("### Recommended Poses")
-    st.markdown(response)  # Ollama output renders as Markdown
-    
-    # Parse common poses from response (simple keyword extract; improve with regex if needed)
-    poses = ["Child's Pose", "Cat-Cow Pose", "Downward Dog", "Cobra Pose", "Tree Pose", "Legs Up the Wall"]
-    for pose in poses:
-        if pose.lower() in response.lower():
-            gif_url = fetch_gif_ddg(pose)
+    remembered = session.recall("recommendations", problem)
+    if remembered is not None:
+        recommendations, gif_urls = remembered
+    else:
+        with st.spinner("Finding poses for you..."):
+            # Typed results from JSON mode; the prompt lives in utils/prompts.py
+            with deadline(RECOMMEND_BUDGET):
+                recommendations = recommend_poses(problem)
+            from_catalog = not recommendations
+            if from_catalog:
+                # LLM down, slow or circuit open: pick from the local catalog instead
+                recommendations = catalog_recommendations(problem)
+
+            # Resolve demo GIFs for every recommended pose in one parallel batch
+            search_names = [
+                pose_resolver.canonical_name(rec.name) for rec in recommendations
+            ]
+            gif_urls = list(get_executor().map(fetch_gif_ddg, search_names))
+        if recommendations and not from_catalog:
+            session.remember("recommendations", problem, (recommendations, gif_urls))
+        if from_catalog:
+            st.info("AI recommendations are unavailable right now; showing poses from our catalog.")
+
+    if not recommendations:
+        st.warning("Couldn't get recommendations right now. Please try again.")
+
+    for rec, gif_url in zip(recommendations, gif_urls):
+        st.markdown(f"#### {rec.title}")
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            st.markdown(rec.to_markdown())
+        with col2:
             if gif_url:
-                st.markdown(f"**{pose} Demo:**")
                 st.image(gif_url, use_container_width=True)
-                break  # Show first matching GIF
@@ -0,0 +1,103 @@
+"""Pre-resized image variants for the pages.
+
+The source logo is a ~1.5 MB PNG shown at 70-120 px. Variants are built
+once per source mtime, stored under ``.cache/assets`` and kept in memory,
+so reruns neither decode the original nor ship it to the browser. Run
+``python -m utils.assets`` at build time to create them ahead of startup.
+"""
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from utils.cache_store import CACHE_DIR
+
+ASSET_DIR = os.path.join(CACHE_DIR, "assets")
+
+LOGO_PATH = "images/image.png"
+
+# Display widths used by the pages (Diet, About, Home)
+LOGO_WIDTHS = (70, 100, 120)
+
+# Rendered at 2x display width so the logo stays sharp on HiDPI screens
+SCALE = 2
+
+_memory: Dict[Tuple[str, int, str, int], bytes] = {}
+_lock = threading.Lock()
+
+
+def _variant_path(path: str, width: int, fmt: str, mtime_ns: int) -> str:
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(ASSET_DIR, f"{stem}-{width}w-{mtime_ns}.{fmt.lower()}")
+
+
+def _build(path: str, width: int, fmt: str) -> bytes:
+    from io import BytesIO
+
+    # Imported here so pages that only read cached variants skip PIL entirely
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img.thumbnail((width * SCALE, width * SCALE * 4), Image.LANCZOS)
+        out = BytesIO()
+        if fmt == "WEBP":
+            img.save(out, "WEBP", quality=85, method=6)
+        else:
+            img.save(out, "PNG", optimize=True)
+    return out.getvalue()
+
+
+def variant(path: str, width: int, fmt: str = "WEBP") -> Optional[bytes]:
+    """Encoded bytes of ``path`` resized for display at ``width`` px.
+
+    Returns None if the source image does not exist. Falls back to PNG
+    when this Pillow build cannot encode WebP.
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    key = (path, width, fmt, mtime_ns)
+    data = _memory.get(key)
+    if data is not None:
+        return data
+
+    with _lock:
+        data = _memory.get(key)
+        if data is not None:
+            return data
+        disk_path = _variant_path(path, width, fmt, mtime_ns)
+        try:
+            with open(disk_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            try:
+                data = _build(path, width, fmt)
+            except (KeyError, OSError):
+                if fmt == "PNG":
+                    raise
+                data = _build(path, width, "PNG")
+            try:
+                os.makedirs(ASSET_DIR, exist_ok=True)
+                with open(disk_path, "wb") as f:
+                    f.write(data)
+            except OSError:
+                pass  # read-only checkout: keep the in-memory copy only
+        _memory[key] = data
+    return data
+
+
+def logo(width: int) -> Optional[bytes]:
+    """The app logo sized for ``width`` px, or None if the file is missing."""
+    return variant(LOGO_PATH, width)
+
+
+def prebuild() -> Dict[int, int]:
+    """Build every logo variant; returns encoded size in bytes per width."""
+    return {width: len(logo(width) or b"") for width in LOGO_WIDTHS}
+
+
+if __name__ == "__main__":
+    source = os.path.getsize(LOGO_PATH) if os.path.exists(LOGO_PATH) else 0
+    print(f"{LOGO_PATH}: {source} bytes")
+    for width, size in prebuild().items():
+        print(f"  {width:>4} px  {size} bytes")
@@ -0,0 +1,171 @@
+import asyncio
+import time
+from typing import Awaitable, Iterable, List
+
+import httpx
+
+from utils import deadline, metrics, ollama_client
+from utils.circuit_breaker import LLMUnavailable
+from utils.deadline import DeadlineExceeded
+from utils.llm_backends import Backend, router
+from utils.rate_limit import limiter
+from utils.http_session import (
+    CONNECT_TIMEOUT,
+    MAX_RETRIES,
+    POOL_SIZE,
+    READ_TIMEOUT,
+    RETRY_STATUSES,
+    retry_delay,
+)
+
+# Upper bound on concurrent upstream calls from one fan-out
+DEFAULT_CONCURRENCY = 4
+
+
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        limits=httpx.Limits(max_connections=POOL_SIZE, max_keepalive_connections=POOL_SIZE),
+    )
+
+
+async def _post_with_retry(
+    client: httpx.AsyncClient,
+    backend: Backend,
+    payload: dict,
+    task: str,
+    max_retries: int = MAX_RETRIES,
+) -> httpx.Response:
+    """Async counterpart of http_session.post_with_retry (same retry policy)."""
+    attempt = 0
+    while True:
+        connect, read = deadline.clamp_timeout(backend.timeout)
+        try:
+            resp = await client.post(
+                backend.url,
+                headers=backend.headers(),
+                json=backend.payload(payload),
+                timeout=httpx.Timeout(read, connect=connect),
+            )
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            delay = retry_delay(attempt, max_retries)
+            if delay is None:
+                raise
+            metrics.inc("cf_llm_retries_total", task=task)
+            await asyncio.sleep(delay)
+            attempt += 1
+            continue
+
+        if resp.status_code not in RETRY_STATUSES:
+            return resp
+
+        delay = retry_delay(attempt, max_retries, resp)
+        if delay is None:
+            return resp
+        metrics.inc("cf_llm_retries_total", task=task)
+        await asyncio.sleep(delay)
+        attempt += 1
+
+
+async def _groq_chat_async(
+    client: httpx.AsyncClient,
+    prompt: str,
+    temperature: float = 0.1,
+    top_p: float = 0.8,
+    max_tokens: int = 1500,
+    task: str = "chat",
+) -> str:
+    """Async version of ollama_client._groq_chat.
+
+    Shares its response cache, in-flight calls, circuit breaker and
+    deadline handling, and raises the same LLMUnavailable/DeadlineExceeded.
+    """
+    key = ollama_client._cache_key(prompt, temperature, top_p, max_tokens)
+    cached = ollama_client._cached(key, task)
+    if cached is not None:
+        return cached
+
+    payload = ollama_client._build_payload(prompt, temperature, top_p, max_tokens, stream=False)
+    call, leader = ollama_client._inflight.acquire(key)
+    if not leader:
+        # Waiting blocks, so do it off the event loop
+        try:
+            content = await asyncio.to_thread(call.wait, deadline.remaining())
+        except TimeoutError as e:
+            raise DeadlineExceeded(str(e)) from e
+        if content is not None:
+            return content
+        # The leader was a stream that failed or was abandoned
+        return await _fetch_chat_async(client, key, payload, task)
+
+    try:
+        content = await _fetch_chat_async(client, key, payload, task)
+    except BaseException as e:
+        ollama_client._inflight.release(key, call, error=e)
+        raise
+    ollama_client._inflight.release(key, call, result=content)
+    return content
+
+
+async def _fetch_chat_async(
+    client: httpx.AsyncClient, key: str, payload: dict, task: str
+) -> str:
+    """Async counterpart of ollama_client._fetch_chat (failover, no hedging)."""
+    with ollama_client._guarded():
+        backends = router.order(queued=limiter.depth())
+        for i, backend in enumerate(backends):
+            deadline.check()
+            retries = ollama_client._retries(i, backends)
+            content, error = await _fetch_from_async(client, backend, payload, task, retries)
+            if error is None:
+                break
+        else:
+            raise ollama_client._unavailable(error, network=httpx.HTTPError) from error
+    if content and ollama_client._persists(backend):
+        ollama_client._response_cache.set(key, content)
+    return content
+
+
+async def _fetch_from_async(
+    client: httpx.AsyncClient, backend: Backend, payload: dict, task: str, max_retries: int
+):
+    """Async counterpart of ollama_client._fetch_from."""
+    # The limiter blocks, so wait for admission off the event loop
+    reserved = await asyncio.to_thread(ollama_client._admit, backend, payload, task)
+    start = time.perf_counter()
+    usage = None
+    error = None
+    content = None
+
+    try:
+        resp = await _post_with_retry(client, backend, payload, task, max_retries)
+        resp.raise_for_status()
+        content, usage = ollama_client._parse_completion(resp.json())
+    except (httpx.HTTPError, LLMUnavailable, KeyError, IndexError, ValueError) as e:
+        error = e
+    finally:
+        ollama_client._finish(backend, task, start, reserved, usage, error)
+    return content, error
+
+
+async def get_pose_info_async(client: httpx.AsyncClient, pose: str) -> str:
+    """Get detailed info for a specific pose."""
+    return await _groq_chat_async(
+        client,
+        ollama_client._pose_info_prompt(pose),
+        max_tokens=ollama_client.POSE_INFO_MAX_TOKENS,
+        task="get_pose_info",
+    )
+
+
+async def gather_bounded(
+    aws: Iterable[Awaitable], limit: int = DEFAULT_CONCURRENCY
+) -> List:
+    """asyncio.gather with at most ``limit`` awaitables running at once."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(aw):
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(_run(aw) for aw in aws))
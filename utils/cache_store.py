@@ -0,0 +1,134 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+# Local on-disk cache directory (override for tests / containers)
+CACHE_DIR = os.environ.get("CF_CACHE_DIR", ".cache")
+
+
+class TTLCache:
+    """SQLite-backed key/value store with per-entry TTL and LRU eviction.
+
+    Entries survive process restarts. Once the table grows past
+    ``max_entries`` the least recently read rows are dropped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: Optional[float] = 7 * 24 * 60 * 60,
+        max_entries: int = 5000,
+        path: Optional[str] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path or os.path.join(CACHE_DIR, f"{name}.sqlite3")
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    last_access REAL NOT NULL
+                )"""
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_last_access ON entries(last_access)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value, or None when missing or expired."""
+        now = time.time()
+        with self._lock:
+            try:
+                db = self._db()
+                row = db.execute(
+                    "SELECT value, expires_at FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or (row[1] is not None and row[1] < now):
+                    if row is not None:
+                        db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                        db.commit()
+                    self.misses += 1
+                    return None
+                db.execute(
+                    "UPDATE entries SET last_access = ? WHERE key = ?", (now, key)
+                )
+                db.commit()
+            except sqlite3.Error:
+                # A broken cache must never break the page
+                self.misses += 1
+                return None
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Store a value; ``ttl`` overrides the cache default for this entry."""
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = now + ttl if ttl else None
+        with self._lock:
+            try:
+                db = self._db()
+                db.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, expires_at, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, value, expires_at, now),
+                )
+                self._evict(db, now)
+                db.commit()
+            except sqlite3.Error:
+                pass
+
+    def _evict(self, db: sqlite3.Connection, now: float) -> None:
+        db.execute(
+            "DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (now,),
+        )
+        (count,) = db.execute("SELECT COUNT(*) FROM entries").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            db.execute(
+                "DELETE FROM entries WHERE key IN ("
+                "SELECT key FROM entries ORDER BY last_access ASC LIMIT ?)",
+                (overflow,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            try:
+                db = self._db()
+                db.execute("DELETE FROM entries")
+                db.commit()
+            except sqlite3.Error:
+                pass
+
+    def stats(self) -> dict:
+        """Hit/miss counters for this process plus the current entry count."""
+        with self._lock:
+            try:
+                (size,) = self._db().execute("SELECT COUNT(*) FROM entries").fetchone()
+            except sqlite3.Error:
+                size = 0
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            "entries": size,
+        }
@@ -0,0 +1,133 @@
+"""Circuit breaker in front of the LLM client.
+
+Closed: calls go through and their outcomes fill a sliding window. Once
+the window has ``MIN_CALLS`` outcomes and either the failure rate or the
+share of calls slower than ``SLOW_CALL_SECONDS`` reaches its threshold,
+the circuit opens. Open: calls fail at once with ``CircuitOpen`` so pages
+serve local content in milliseconds instead of waiting out timeouts.
+After ``OPEN_SECONDS`` the circuit is half-open: a single probe call goes
+through; a fast success closes the circuit, anything else opens it again.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Tuple
+
+from utils import metrics
+
+WINDOW = 20
+MIN_CALLS = 5
+FAILURE_RATE = float(os.environ.get("CF_LLM_CB_FAILURE_RATE", "0.5"))
+SLOW_CALL_SECONDS = float(os.environ.get("CF_LLM_CB_SLOW_CALL", "10"))
+SLOW_CALL_RATE = 0.8
+OPEN_SECONDS = float(os.environ.get("CF_LLM_CB_OPEN_SECONDS", "30"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Gauge values for cf_llm_circuit_state
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class LLMUnavailable(RuntimeError):
+    """No answer from any LLM backend; the message says why."""
+
+
+class CircuitOpen(LLMUnavailable):
+    """The circuit is open: the call was not attempted."""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        window: int = WINDOW,
+        min_calls: int = MIN_CALLS,
+        failure_rate: float = FAILURE_RATE,
+        slow_call_seconds: float = SLOW_CALL_SECONDS,
+        slow_call_rate: float = SLOW_CALL_RATE,
+        open_seconds: float = OPEN_SECONDS,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window)  # (failed, slow)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> None:
+        """Raise CircuitOpen unless a call may go upstream now."""
+        now = time.monotonic()
+        with self._lock:
+            if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+                self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN:
+                # One probe at a time; a probe that never reported back is replaced
+                if self._probe_started is None or now - self._probe_started >= self.open_seconds:
+                    self._probe_started = now
+                    return
+            elif self._state == CLOSED:
+                return
+        metrics.inc("cf_llm_circuit_rejections_total", circuit=self.name)
+        raise CircuitOpen(f"LLM circuit '{self.name}' is open")
+
+    def record(self, seconds: float, ok: bool) -> None:
+        """Report the outcome of a call admitted by allow()."""
+        with self._lock:
+            slow = seconds >= self.slow_call_seconds
+            if self._state == HALF_OPEN:
+                self._probe_started = None
+                self._transition(CLOSED if ok and not slow else OPEN)
+                return
+            self._outcomes.append((not ok, slow))
+            if self._state == CLOSED and self._tripped():
+                self._transition(OPEN)
+
+    def cancel(self) -> None:
+        """Forget a call admitted by allow() that never went upstream."""
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probe_started = None
+
+    def _tripped(self) -> bool:
+        n = len(self._outcomes)
+        if n < self.min_calls:
+            return False
+        failed = sum(f for f, _ in self._outcomes)
+        slow = sum(s for _, s in self._outcomes)
+        return failed / n >= self.failure_rate or slow / n >= self.slow_call_rate
+
+    def _transition(self, state: str) -> None:
+        # Called with the lock held
+        self._state = state
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+        # Each state judges only the calls made since entering it
+        self._outcomes.clear()
+        metrics.set_gauge("cf_llm_circuit_state", _STATE_VALUES[state], circuit=self.name)
+        metrics.inc("cf_llm_circuit_transitions_total", circuit=self.name, state=state)
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = len(self._outcomes)
+            return {
+                "state": self._state,
+                "calls": n,
+                "failures": sum(f for f, _ in self._outcomes),
+                "slow": sum(s for _, s in self._outcomes),
+            }
+
+
+breaker = CircuitBreaker("llm")
@@ -0,0 +1,61 @@
+"""End-to-end time budgets for LLM calls.
+
+A page wraps its LLM work in ``with deadline(seconds):``. The budget
+travels through contextvars to everything below it: the rate-limiter
+queue, single-flight waits, socket timeouts, retry backoff and
+streaming reads all stop at the deadline, and ``DeadlineExceeded`` is
+raised so the page can degrade to local content.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional, Tuple
+
+_expires_at: ContextVar[Optional[float]] = ContextVar("cf_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The caller's time budget ran out before the LLM answered."""
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """Limit everything in the block to ``seconds`` (nested budgets only shrink)."""
+    expires_at = time.monotonic() + seconds
+    current = _expires_at.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+    token = _expires_at.set(expires_at)
+    try:
+        yield
+    finally:
+        _expires_at.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left in the current budget, or None without a deadline."""
+    expires_at = _expires_at.get()
+    if expires_at is None:
+        return None
+    return max(0.0, expires_at - time.monotonic())
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check() -> None:
+    """Raise DeadlineExceeded if the current budget is used up."""
+    if expired():
+        raise DeadlineExceeded("LLM time budget exceeded")
+
+
+def clamp_timeout(timeout: Tuple[float, float]) -> Tuple[float, float]:
+    """(connect, read) timeouts shortened to the remaining budget."""
+    left = remaining()
+    if left is None:
+        return timeout
+    # requests rejects a zero timeout; the next check() reports the expiry
+    left = max(left, 0.001)
+    return min(timeout[0], left), min(timeout[1], left)
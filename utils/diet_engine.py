@@ -0,0 +1,289 @@
+import json
+import math
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "foods.json")
+
+# Diets ordered from most to least restrictive: a food fits any diet at or after its own
+DIET_ORDER = ("vegan", "vegetarian", "non-vegetarian")
+DIET_ALIASES = {"balanced": "non-vegetarian", "veg": "vegetarian", "non-veg": "non-vegetarian"}
+
+ACTIVITY_FACTORS = {"low": 1.2, "moderate": 1.55, "high": 1.725}
+
+# Share of daily calories per meal
+MEAL_SPLIT = (("Breakfast", 0.25), ("Lunch", 0.35), ("Snack", 0.10), ("Dinner", 0.30))
+
+# Calorie adjustment and protein (g per kg body weight) per goal
+GOALS = {
+    "lose": {"kcal_delta": -500, "protein_per_kg": 1.6, "prefer": "high-protein"},
+    "gain": {"kcal_delta": 300, "protein_per_kg": 1.8, "prefer": "high-protein"},
+    "maintain": {"kcal_delta": 0, "protein_per_kg": 1.2, "prefer": "balanced"},
+}
+MIN_KCAL = 1200
+
+DAYS = 3
+
+# Portions come in quarter servings between half and triple
+SERVING_STEP = 0.25
+MIN_SERVINGS = 0.5
+MAX_SERVINGS = 3.0
+
+# Profiles are snapped to these bucket widths before planning, so
+# near-identical users (70.0 vs 70.5 kg) share one plan and one cache entry
+BUCKET_WIDTHS = {"age": 5, "weight_kg": 2.5, "height_cm": 5.0}
+
+# Bump when build_plan's output changes so cached plans are not reused
+PLAN_VERSION = 2
+
+
+@dataclass(frozen=True)
+class Food:
+    name: str
+    meal: str
+    diet: str
+    kcal: int
+    protein_g: float
+    carbs_g: float
+    fat_g: float
+    tags: Tuple[str, ...]
+
+
+@dataclass
+class Meal:
+    slot: str
+    dish: str
+    servings: float
+    kcal: int
+    protein_g: int
+
+
+@dataclass
+class DayPlan:
+    day: int
+    meals: List[Meal]
+
+    @property
+    def kcal(self) -> int:
+        return sum(m.kcal for m in self.meals)
+
+    @property
+    def protein_g(self) -> int:
+        return sum(m.protein_g for m in self.meals)
+
+
+@dataclass
+class DietPlan:
+    age: float
+    gender: str
+    weight_kg: float
+    height_cm: float
+    goal: str
+    diet_type: str
+    activity_level: str
+    bmr: int
+    tdee: int
+    target_kcal: int
+    protein_target_g: int
+    days: List[DayPlan] = field(default_factory=list)
+
+
+def _load(path: str) -> Dict[Tuple[str, str], List[Food]]:
+    """Index foods by (meal slot, diet type) so selection is a dict lookup."""
+    with open(path, encoding="utf-8") as f:
+        rows = json.load(f)
+
+    index: Dict[Tuple[str, str], List[Food]] = {}
+    for row in rows:
+        food = Food(
+            name=row["name"],
+            meal=row["meal"],
+            diet=row["diet"],
+            kcal=row["kcal"],
+            protein_g=row["protein_g"],
+            carbs_g=row["carbs_g"],
+            fat_g=row["fat_g"],
+            tags=tuple(row.get("tags", ())),
+        )
+        for diet in DIET_ORDER[DIET_ORDER.index(food.diet):]:
+            index.setdefault((food.meal, diet), []).append(food)
+    return index
+
+
+FOODS = _load(DATA_PATH)
+
+
+def normalize_diet(diet_type: str) -> str:
+    diet = diet_type.strip().lower()
+    diet = DIET_ALIASES.get(diet, diet)
+    return diet if diet in DIET_ORDER else "non-vegetarian"
+
+
+# Whole-word goal keywords, strongest first: an explicit verb decides before
+# words like "fat" or "muscle" that show up on both sides ("gain healthy fat")
+_GOAL_KEYWORDS = (
+    ("lose", {"loss", "lose", "losing", "cut", "cutting", "slim", "slimming", "burn"}),
+    ("gain", {"gain", "gaining", "bulk", "bulking", "mass"}),
+    ("lose", {"fat", "lean"}),
+    ("gain", {"muscle", "muscles", "build", "building"}),
+)
+
+
+def normalize_goal(goal: str) -> str:
+    """Map free-text goals ("weight loss", "build muscle") to lose/gain/maintain."""
+    words = set(re.findall(r"[a-z]+", goal.lower()))
+    for target, keywords in _GOAL_KEYWORDS:
+        if words & keywords:
+            return target
+    return "maintain"
+
+
+def normalize_gender(gender: str) -> str:
+    g = gender.strip().lower()
+    if g.startswith("m"):
+        return "male"
+    if g.startswith("f"):
+        return "female"
+    return "other"
+
+
+def _bucket_mid(value: float, width: float) -> float:
+    return (math.floor(value / width) + 0.5) * width
+
+
+def quantize_profile(
+    age: int,
+    gender: str,
+    weight_kg: float,
+    height_cm: float,
+    goal: str,
+    diet_type: str = "balanced",
+    activity_level: str = "moderate",
+) -> dict:
+    """Snap a profile to its bucket (midpoints of BUCKET_WIDTHS, normalized text)."""
+    activity = activity_level.strip().lower()
+    return {
+        "age": _bucket_mid(age, BUCKET_WIDTHS["age"]),
+        "gender": normalize_gender(gender),
+        "weight_kg": _bucket_mid(weight_kg, BUCKET_WIDTHS["weight_kg"]),
+        "height_cm": _bucket_mid(height_cm, BUCKET_WIDTHS["height_cm"]),
+        "goal": normalize_goal(goal),
+        "diet_type": normalize_diet(diet_type),
+        "activity_level": activity if activity in ACTIVITY_FACTORS else "moderate",
+    }
+
+
+def bucket_key(profile: dict) -> str:
+    """Stable cache key for a quantized profile."""
+    return json.dumps(dict(profile, plan_version=PLAN_VERSION), sort_keys=True)
+
+
+def bmr(age: int, gender: str, weight_kg: float, height_cm: float) -> float:
+    """Mifflin-St Jeor basal metabolic rate (kcal/day)."""
+    base = 10 * weight_kg + 6.25 * height_cm - 5 * age
+    g = normalize_gender(gender)
+    if g == "male":
+        return base + 5
+    if g == "female":
+        return base - 161
+    return base - 78  # midpoint when gender is not specified
+
+
+def _pick(candidates: List[Food], target: float, prefer: str, day: int) -> Food:
+    # Rank by closeness to the calorie target, preferred tag first, then rotate per day
+    ranked = sorted(
+        candidates,
+        key=lambda f: (prefer not in f.tags, abs(f.kcal - target), f.name),
+    )
+    return ranked[day % len(ranked)]
+
+
+def _servings(food: Food, target: float) -> float:
+    steps = round(target / food.kcal / SERVING_STEP)
+    return min(MAX_SERVINGS, max(MIN_SERVINGS, steps * SERVING_STEP))
+
+
+def build_plan(
+    age: int,
+    gender: str,
+    weight_kg: float,
+    height_cm: float,
+    goal: str,
+    diet_type: str = "balanced",
+    activity_level: str = "moderate",
+) -> DietPlan:
+    """Deterministic 3-day plan from the food table; no network calls."""
+    goal_key = normalize_goal(goal)
+    diet = normalize_diet(diet_type)
+    settings = GOALS[goal_key]
+
+    base = bmr(age, gender, weight_kg, height_cm)
+    tdee = base * ACTIVITY_FACTORS.get(activity_level.lower(), ACTIVITY_FACTORS["moderate"])
+    target = max(MIN_KCAL, tdee + settings["kcal_delta"])
+
+    plan = DietPlan(
+        age=age,
+        gender=gender,
+        weight_kg=weight_kg,
+        height_cm=height_cm,
+        goal=goal_key,
+        diet_type=diet,
+        activity_level=activity_level,
+        bmr=round(base),
+        tdee=round(tdee),
+        target_kcal=round(target),
+        protein_target_g=round(settings["protein_per_kg"] * weight_kg),
+    )
+
+    for day in range(DAYS):
+        meals = []
+        # Calories a meal's rounded portion missed are made up by the next meal
+        carry = 0.0
+        for slot, share in MEAL_SPLIT:
+            slot_target = target * share
+            food = _pick(FOODS[(slot.lower(), diet)], slot_target, settings["prefer"], day)
+            servings = _servings(food, slot_target + carry)
+            carry += slot_target - food.kcal * servings
+            meals.append(
+                Meal(
+                    slot=slot,
+                    dish=food.name,
+                    servings=servings,
+                    kcal=round(food.kcal * servings),
+                    protein_g=round(food.protein_g * servings),
+                )
+            )
+        plan.days.append(DayPlan(day=day + 1, meals=meals))
+    return plan
+
+
+def _servings_label(servings: float) -> str:
+    if servings == 1:
+        return ""
+    return f" × {servings:g}"
+
+
+def to_markdown(plan: DietPlan) -> str:
+    lines = [
+        f"**Daily target:** ~{plan.target_kcal} kcal · {plan.protein_target_g} g protein "
+        f"(BMR {plan.bmr} kcal, maintenance {plan.tdee} kcal, goal: {plan.goal})",
+        "",
+    ]
+    for day in plan.days:
+        lines.append(f"### Day {day.day}")
+        for meal in day.meals:
+            lines.append(
+                f"- **{meal.slot}:** {meal.dish}{_servings_label(meal.servings)} "
+                f"— ~{meal.kcal} kcal, {meal.protein_g} g protein"
+            )
+        lines.append(f"- *Total: ~{day.kcal} kcal, {day.protein_g} g protein*")
+        lines.append("")
+    return "\n".join(lines).rstrip()
+
+
+DEFAULT_NOTES = """### Daily Notes
+- Drink 2.5–3 litres of water spread through the day.
+- Keep portions steady and adjust by ±10% based on weekly progress.
+- This is general guidance, not medical advice."""
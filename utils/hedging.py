@@ -0,0 +1,70 @@
+"""Hedged LLM requests.
+
+If a call is still running after the p95 of its task's recent latencies,
+a duplicate goes out (to the next backend when there is one) and the
+first successful answer wins. Non-streaming calls are timed to the full
+answer; streams are hedged only while connecting, timed to the first
+byte. Hedges are capped at ``HEDGE_BUDGET`` of all calls so a slow
+upstream is not hit with twice the load. Off unless ``CF_LLM_HEDGE=1``.
+"""
+import math
+import os
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+HEDGE_ENABLED = os.environ.get("CF_LLM_HEDGE", "0") == "1"
+
+# At most this share of calls may send a second request
+HEDGE_BUDGET = float(os.environ.get("CF_LLM_HEDGE_BUDGET", "0.1"))
+
+# p95 of fewer samples is mostly noise
+MIN_SAMPLES = 20
+
+# Recent latencies kept per (task, stream); old ones age out
+WINDOW = 200
+
+_lock = threading.Lock()
+_calls = 0
+_hedges = 0
+_latencies: Dict[Tuple[str, bool], Deque[float]] = {}
+
+
+def observe(task: str, seconds: float, stream: bool = False) -> None:
+    """Record a successful call's latency (time to first byte for streams)."""
+    with _lock:
+        _latencies.setdefault((task, stream), deque(maxlen=WINDOW)).append(seconds)
+
+
+def _p95(samples) -> float:
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+
+
+def hedge_delay(task: str, stream: bool = False) -> Optional[float]:
+    """Seconds to wait before hedging a call for ``task``, or None to not hedge.
+
+    Also counts the call towards the hedge budget.
+    """
+    global _calls
+    with _lock:
+        _calls += 1
+        samples = list(_latencies.get((task, stream), ()))
+    if not HEDGE_ENABLED or len(samples) < MIN_SAMPLES:
+        return None
+    return _p95(samples)
+
+
+def try_spend() -> bool:
+    """Take one hedge from the budget; False once hedges would exceed it."""
+    global _hedges
+    with _lock:
+        if _hedges + 1 > HEDGE_BUDGET * _calls:
+            return False
+        _hedges += 1
+        return True
+
+
+def stats() -> dict:
+    with _lock:
+        return {"enabled": HEDGE_ENABLED, "calls": _calls, "hedges": _hedges, "budget": HEDGE_BUDGET}
@@ -0,0 +1,130 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils import deadline
+
+# Connection pool shared by every Streamlit session in this process
+POOL_SIZE = int(os.environ.get("CF_HTTP_POOL_SIZE", "16"))
+
+# Separate connect/read timeouts (seconds)
+CONNECT_TIMEOUT = 5.0
+READ_TIMEOUT = 30.0
+
+# Bounded exponential backoff for transient failures
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 8.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Process-wide keep-alive session (created lazily, reused by all threads)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def _retry_after(resp: requests.Response) -> Optional[float]:
+    """Seconds to wait according to a Retry-After header, if any."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff(attempt: int) -> float:
+    # Full jitter keeps concurrent sessions from retrying in lockstep
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _past_deadline(delay: float) -> bool:
+    """True if sleeping ``delay`` would leave no budget for another attempt."""
+    left = deadline.remaining()
+    return left is not None and left <= delay
+
+
+def retry_delay(attempt: int, max_retries: int, resp=None) -> Optional[float]:
+    """Seconds to wait before retrying failed ``attempt``, or None to give up.
+
+    ``resp`` is the 429/5xx response (its Retry-After wins over backoff),
+    or None if the connection failed. Shared with utils.async_client.
+    """
+    if attempt >= max_retries:
+        return None
+    delay = _retry_after(resp) if resp is not None else None
+    delay = _backoff(attempt) if delay is None else min(delay, BACKOFF_MAX)
+    return None if _past_deadline(delay) else delay
+
+
+def post_with_retry(
+    url: str,
+    headers: dict,
+    json: dict,
+    stream: bool = False,
+    timeout: tuple = (CONNECT_TIMEOUT, READ_TIMEOUT),
+    max_retries: int = MAX_RETRIES,
+    on_retry: Optional[Callable[[], None]] = None,
+) -> requests.Response:
+    """POST through the pooled session, retrying 429/5xx and connect failures.
+
+    Read timeouts are not retried: the caller has already waited the full
+    read budget. The last response is returned as-is, so callers still
+    call ``raise_for_status()``. Timeouts and retries are cut short by the
+    caller's deadline (utils.deadline), if one is set.
+    """
+    session = get_session()
+    attempt = 0
+    while True:
+        try:
+            resp = session.post(
+                url,
+                headers=headers,
+                json=json,
+                stream=stream,
+                timeout=deadline.clamp_timeout(timeout),
+            )
+        except requests.exceptions.ConnectionError:
+            delay = retry_delay(attempt, max_retries)
+            if delay is None:
+                raise
+            if on_retry is not None:
+                on_retry()
+            time.sleep(delay)
+            attempt += 1
+            continue
+
+        if resp.status_code not in RETRY_STATUSES:
+            return resp
+
+        delay = retry_delay(attempt, max_retries, resp)
+        if delay is None:
+            return resp
+        resp.close()
+        if on_retry is not None:
+            on_retry()
+        time.sleep(delay)
+        attempt += 1
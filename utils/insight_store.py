@@ -0,0 +1,20 @@
+from typing import Optional
+
+from utils.cache_store import TTLCache
+from utils.pose_catalog import normalize_name
+
+# Durable pose insights written by the prewarm job (no expiry)
+_store = TTLCache("pose_insights", ttl=None, max_entries=20000)
+
+
+def get_insight(pose: str) -> Optional[str]:
+    """Stored insight markdown for a pose, or None."""
+    return _store.get(normalize_name(pose))
+
+
+def put_insight(pose: str, text: str) -> None:
+    _store.set(normalize_name(pose), text)
+
+
+def stats() -> dict:
+    return _store.stats()
@@ -0,0 +1,201 @@
+"""LLM providers behind one OpenAI-compatible chat-completions interface.
+
+``LLM_BACKENDS`` lists the providers to use, in preference order
+(default ``groq``; e.g. ``groq,ollama`` or ``ollama`` for fully offline
+runs). The router tries healthy backends fastest-first by observed
+latency and fails over to the next one on connection errors, timeouts
+and 429/5xx responses.
+"""
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import streamlit as st
+
+from utils import metrics
+from utils.circuit_breaker import LLMUnavailable
+from utils.http_session import CONNECT_TIMEOUT, READ_TIMEOUT
+
+# Overridable so tests and the prewarm job can point at a local stub server
+GROQ_BASE_URL = os.environ.get(
+    "GROQ_BASE_URL", "https://api.groq.com/openai/v1/chat/completions"
+)
+GROQ_MODEL = os.environ.get("GROQ_MODEL", "qwen/qwen3-32b")
+
+# Ollama, llama.cpp server, vLLM, ... anything OpenAI-compatible
+OLLAMA_BASE_URL = os.environ.get(
+    "OLLAMA_BASE_URL", "http://127.0.0.1:11434/v1/chat/completions"
+)
+OLLAMA_MODEL = os.environ.get("OLLAMA_MODEL", "qwen3:8b")
+
+LLM_BACKENDS = os.environ.get("LLM_BACKENDS", "groq")
+
+# Weight of the newest sample in the latency moving average
+EWMA_ALPHA = 0.3
+
+# A backend failing this many calls in a row sits out for COOLDOWN seconds
+MAX_FAILURES = 3
+COOLDOWN = 30.0
+
+
+@lru_cache(maxsize=1)
+def _groq_key() -> str:
+    """Groq key, resolved on the first upstream call rather than at import.
+
+    GROQ_API_KEY wins (bench runs, containers); otherwise the fixed
+    secrets key for Streamlit Cloud. Raises LLMUnavailable if neither is set.
+    """
+    key = os.environ.get("GROQ_API_KEY")
+    if key:
+        return key
+    try:
+        return st.secrets["key"]
+    except Exception as e:
+        # Missing secrets.toml raises Streamlit's own error, a missing entry KeyError
+        raise LLMUnavailable("No Groq API key: set GROQ_API_KEY or the 'key' secret") from e
+
+
+@dataclass
+class Backend:
+    """One OpenAI-compatible chat-completions endpoint."""
+
+    name: str
+    url: str
+    model: str
+    # Remote APIs with quotas go through utils.rate_limit
+    rate_limited: bool = False
+    timeout: tuple = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+    def api_key(self) -> Optional[str]:
+        return None
+
+    def headers(self) -> dict:
+        headers = {"Content-Type": "application/json"}
+        key = self.api_key()
+        if key:
+            headers["Authorization"] = f"Bearer {key}"
+        return headers
+
+    def payload(self, payload: dict) -> dict:
+        return dict(payload, model=self.model)
+
+
+@dataclass
+class GroqBackend(Backend):
+    name: str = "groq"
+    url: str = GROQ_BASE_URL
+    model: str = GROQ_MODEL
+    rate_limited: bool = True
+
+    def api_key(self) -> Optional[str]:
+        return _groq_key()
+
+
+@dataclass
+class OpenAICompatibleBackend(Backend):
+    """Local server (Ollama / llama.cpp); the key is optional."""
+
+    name: str = "ollama"
+    url: str = OLLAMA_BASE_URL
+    model: str = OLLAMA_MODEL
+    # Local generation is slower per token but has no queue in front of it
+    timeout: tuple = (2.0, 120.0)
+
+    def api_key(self) -> Optional[str]:
+        return os.environ.get("OLLAMA_API_KEY")
+
+
+_FACTORIES = {
+    "groq": GroqBackend,
+    "ollama": OpenAICompatibleBackend,
+}
+
+
+@dataclass
+class _Health:
+    latency: Optional[float] = None  # EWMA seconds, None until first success
+    failures: int = 0
+    down_until: float = 0.0
+    calls: int = 0
+
+
+class Router:
+    """Orders backends by health and observed latency."""
+
+    def __init__(self, backends: List[Backend]):
+        self.backends = backends
+        self._health: Dict[str, _Health] = {b.name: _Health() for b in backends}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Backend:
+        return next(b for b in self.backends if b.name == name)
+
+    def order(self, queued: int = 0) -> List[Backend]:
+        """Backends to try, best first.
+
+        Healthy before cooling down; then by EWMA latency (an untried
+        backend counts as fast so it gets measured once); configuration
+        order breaks ties. While ``queued`` calls are already waiting for
+        the rate limiter, unlimited (local) backends go first.
+        """
+        now = time.monotonic()
+        with self._lock:
+            def rank(item):
+                index, backend = item
+                health = self._health[backend.name]
+                return (
+                    health.down_until > now,
+                    bool(queued) and backend.rate_limited,
+                    health.latency or 0.0,
+                    index,
+                )
+
+            return [b for _, b in sorted(enumerate(self.backends), key=rank)]
+
+    def record(self, backend: Backend, seconds: float, ok: bool) -> None:
+        with self._lock:
+            health = self._health[backend.name]
+            health.calls += 1
+            if ok:
+                health.failures = 0
+                health.down_until = 0.0
+                health.latency = (
+                    seconds
+                    if health.latency is None
+                    else EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * health.latency
+                )
+            else:
+                health.failures += 1
+                if health.failures >= MAX_FAILURES:
+                    health.down_until = time.monotonic() + COOLDOWN
+            latency = health.latency
+        metrics.inc("cf_llm_backend_calls_total", backend=backend.name, outcome="ok" if ok else "error")
+        if latency is not None:
+            metrics.set_gauge("cf_llm_backend_latency_ewma_seconds", latency, backend=backend.name)
+
+    def stats(self) -> Dict[str, dict]:
+        now = time.monotonic()
+        with self._lock:
+            return {
+                name: {
+                    "latency_ewma": h.latency,
+                    "failures": h.failures,
+                    "healthy": h.down_until <= now,
+                    "calls": h.calls,
+                }
+                for name, h in self._health.items()
+            }
+
+
+def _configured() -> List[Backend]:
+    names = [n.strip().lower() for n in LLM_BACKENDS.split(",") if n.strip()]
+    unknown = [n for n in names if n not in _FACTORIES]
+    if unknown:
+        raise ValueError(f"Unknown LLM_BACKENDS entries: {', '.join(unknown)}")
+    return [_FACTORIES[n]() for n in names or ["groq"]]
+
+
+router = Router(_configured())
@@ -0,0 +1,117 @@
+import os
+from typing import Callable, List, Optional
+
+from utils.cache_store import TTLCache
+from utils.pose_catalog import normalize_name
+
+# Found URLs are stable for a long time; "nothing found" is re-checked sooner
+HIT_TTL = 30 * 24 * 60 * 60
+MISS_TTL = 30 * 60
+
+# Stored value for a negative (no result) lookup
+_MISS = ""
+
+_store = TTLCache("media_urls", ttl=HIT_TTL, max_entries=5000)
+
+# Optional HTTP search backend returning DDG-shaped results (bench/mock_server.py)
+MEDIA_SEARCH_URL = os.environ.get("CF_MEDIA_SEARCH_URL")
+
+
+def _search_http(kind: str, query: str, max_results: int) -> List[dict]:
+    from utils.http_session import CONNECT_TIMEOUT, READ_TIMEOUT, get_session
+
+    resp = get_session().get(
+        f"{MEDIA_SEARCH_URL.rstrip('/')}/{kind}",
+        params={"q": query, "max_results": max_results},
+        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT),
+    )
+    resp.raise_for_status()
+    return resp.json()["results"]
+
+
+def _search_videos(name: str) -> List[dict]:
+    if MEDIA_SEARCH_URL:
+        return _search_http("videos", f"{name} yoga pose", 5)
+
+    from duckduckgo_search import DDGS
+
+    return list(
+        DDGS().videos(
+            keywords=f"{name} yoga pose",
+            region="in-en",
+            safesearch="moderate",
+            timelimit=None,
+            max_results=5,
+        )
+    )
+
+
+def _search_gifs(name: str) -> List[dict]:
+    if MEDIA_SEARCH_URL:
+        return _search_http("images", f"{name} yoga pose gif animation", 3)
+
+    from duckduckgo_search import DDGS
+
+    with DDGS() as ddgs:
+        return list(ddgs.images(f"{name} yoga pose gif animation", max_results=3))
+
+
+def _pick_video(results: List[dict]) -> Optional[str]:
+    # Prefer the actual video URL from 'content' / 'href', fallback to thumbnail
+    for r in results:
+        url = r.get("content") or r.get("href") or r.get("thumbnail")
+        if not url:
+            continue
+        if not url.startswith("http"):
+            continue
+        if "base64," in url:
+            continue
+        return url
+    return None
+
+
+def _pick_gif(results: List[dict]) -> Optional[str]:
+    for r in results:
+        url = r.get("image")
+        if url and url.startswith("https") and (".gif" in url.lower() or "gif" in r.get("title", "").lower()):
+            return url
+    return None
+
+
+def _resolve(
+    kind: str,
+    name: str,
+    search: Callable[[str], List[dict]],
+    pick: Callable[[List[dict]], Optional[str]],
+) -> Optional[str]:
+    key = f"{kind}:{normalize_name(name)}"
+    cached = _store.get(key)
+    if cached is not None:
+        return cached or None
+
+    try:
+        results = search(name)
+    except Exception:
+        # Errors (DDG rate limits included) are never cached: the next render retries
+        return None
+
+    url = pick(results)
+    _store.set(key, url or _MISS, ttl=HIT_TTL if url else MISS_TTL)
+    return url
+
+
+def fetch_video_ddg(name: str) -> Optional[str]:
+    """
+    Fetch a yoga pose video URL for the given asana name using DuckDuckGo.
+    Returns a single HTTPS video URL or None.
+    """
+    return _resolve("video", name, _search_videos, _pick_video)
+
+
+def fetch_gif_ddg(name: str) -> Optional[str]:
+    """Fetch yoga pose GIF using DuckDuckGo."""
+    return _resolve("gif", name, _search_gifs, _pick_gif)
+
+
+def stats() -> dict:
+    return _store.stats()
@@ -0,0 +1,175 @@
+"""In-process metrics for the LLM client.
+
+Counters, gauges and latency histograms keyed by name + labels. Export
+with ``render_prometheus()`` (served on ``CF_METRICS_PORT`` if set) or
+append every recorded call to the JSONL file named by ``CF_METRICS_LOG``.
+"""
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+# Seconds; the last bucket is +Inf
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, float("inf"))
+
+METRICS_LOG = os.environ.get("CF_METRICS_LOG")
+METRICS_PORT = os.environ.get("CF_METRICS_PORT")
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+_lock = threading.Lock()
+_counters: Dict[_Key, float] = {}
+_gauges: Dict[_Key, float] = {}
+_histograms: Dict[_Key, list] = {}  # [bucket counts..., sum, count]
+
+
+def _key(name: str, labels: dict) -> _Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name: str, value: float = 1, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def observe(name: str, value: float, **labels) -> None:
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = [0] * len(LATENCY_BUCKETS) + [0.0, 0]
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                hist[i] += 1
+                break
+        hist[-2] += value
+        hist[-1] += 1
+
+
+def record_call(
+    task: str,
+    seconds: float,
+    usage: Optional[dict] = None,
+    error: Optional[BaseException] = None,
+) -> None:
+    """Record one upstream LLM call for an entry point (``task``)."""
+    inc("cf_llm_requests_total", task=task)
+    observe("cf_llm_latency_seconds", seconds, task=task)
+    if usage:
+        inc("cf_llm_prompt_tokens_total", usage.get("prompt_tokens", 0), task=task)
+        inc("cf_llm_completion_tokens_total", usage.get("completion_tokens", 0), task=task)
+    if error is not None:
+        inc("cf_llm_errors_total", task=task, error=type(error).__name__)
+    if METRICS_LOG:
+        _log(
+            {
+                "ts": time.time(),
+                "task": task,
+                "latency_s": round(seconds, 4),
+                "prompt_tokens": (usage or {}).get("prompt_tokens"),
+                "completion_tokens": (usage or {}).get("completion_tokens"),
+                "error": type(error).__name__ if error is not None else None,
+            }
+        )
+
+
+def _log(event: dict) -> None:
+    try:
+        with _lock, open(METRICS_LOG, "a", encoding="utf-8") as f:
+            f.write(json.dumps(event) + "\n")
+    except OSError:
+        pass
+
+
+def _fmt_labels(labels, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def render_prometheus() -> str:
+    """Prometheus text exposition of everything recorded so far."""
+    lines = []
+    with _lock:
+        for kind, store in (("counter", _counters), ("gauge", _gauges)):
+            seen = set()
+            for (name, labels), value in sorted(store.items()):
+                if name not in seen:
+                    lines.append(f"# TYPE {name} {kind}")
+                    seen.add(name)
+                lines.append(f"{name}{_fmt_labels(labels)} {value:g}")
+        seen = set()
+        for (name, labels), hist in sorted(_histograms.items()):
+            if name not in seen:
+                lines.append(f"# TYPE {name} histogram")
+                seen.add(name)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, hist):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                le_label = 'le="%s"' % le
+                lines.append(f"{name}_bucket{_fmt_labels(labels, le_label)} {cumulative}")
+            lines.append(f"{name}_sum{_fmt_labels(labels)} {hist[-2]:g}")
+            lines.append(f"{name}_count{_fmt_labels(labels)} {hist[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+def quantile(name: str, q: float, **labels) -> Optional[float]:
+    """Upper bucket bound containing quantile q of a histogram, or None if empty."""
+    with _lock:
+        hist = _histograms.get(_key(name, labels))
+        if not hist or not hist[-1]:
+            return None
+        target = q * hist[-1]
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS, hist):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+    return None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+
+
+def serve(port: int, host: str = "127.0.0.1") -> None:
+    """Expose /metrics on a background thread (idempotent)."""
+    global _server
+    with _lock:
+        if _server is not None:
+            return
+        try:
+            _server = ThreadingHTTPServer((host, port), _Handler)
+        except OSError:
+            # Another Streamlit process already owns the port
+            return
+    threading.Thread(target=_server.serve_forever, daemon=True, name="cf-metrics").start()
+
+
+if METRICS_PORT:
+    serve(int(METRICS_PORT))
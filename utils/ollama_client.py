@@ -1,69 +1,759 @@
+import contextvars
+import hashlib
+import json
+import re
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures import as_completed, wait
+from contextlib import contextmanager
+from functools import partial
+from typing import Iterator, List, Optional, Tuple
+
 import requests
-import streamlit as st
 
-# Fixed secrets key for Streamlit Cloud
-api_key = st.secrets["key"]  
+from utils import deadline, diet_engine, hedging, metrics, prompts
+from utils.circuit_breaker import LLMUnavailable, breaker
+from utils.deadline import DeadlineExceeded
+from utils.pool import get_executor
+from utils.rate_limit import limiter
+from utils.semantic_cache import SemanticCache
+from utils.recommendations import PoseRecommendation, parse_recommendations
+from utils.cache_store import TTLCache
+from utils.http_session import MAX_RETRIES, post_with_retry
+from utils.llm_backends import GROQ_MODEL, Backend, router
+from utils.singleflight import SingleFlight
+
+# Persistent response cache (survives restarts, LRU-bounded)
+_response_cache = TTLCache("llm_responses", ttl=7 * 24 * 60 * 60, max_entries=5000)
+
+# Finished diet plans per quantized profile bucket
+_diet_cache = TTLCache("diet_plans", ttl=30 * 24 * 60 * 60, max_entries=2000)
+
+# Paraphrased problems ("pain in my lower back") reuse earlier recommendations
+_recommend_cache = SemanticCache("recommendations")
+
+# Identical prompts in flight at the same time share one upstream call
+_inflight = SingleFlight()
+
+# When the current guarded call's first attempt got past the rate limiter;
+# the circuit breaker times upstream calls from there, not from our own queue
+_admitted: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar(
+    "cf_llm_admitted", default=None
+)
+
+
+# The diet LLM call only writes the notes section now
+DIET_NOTES_MAX_TOKENS = 250
+
+# Pose info is a few benefit bullets, a few steps and a hold time
+POSE_INFO_MAX_TOKENS = 400
+
+# OpenAI-compatible JSON mode: the reply is guaranteed to be one JSON object
+JSON_MODE = {"type": "json_object"}
+
+# Recommendations are a few short JSON records, not free-form Markdown
+RECOMMEND_MAX_TOKENS = 800
+
+
+def _normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace and case so trivially different prompts share a key."""
+    return re.sub(r"\s+", " ", prompt).strip().casefold()
+
+
+def _cache_key(
+    prompt: str,
+    temperature: float,
+    top_p: float,
+    max_tokens: int,
+    response_format: Optional[dict] = None,
+) -> str:
+    raw = json.dumps(
+        [router.backends[0].model, temperature, top_p, max_tokens, _normalize_prompt(prompt)]
+        + ([response_format] if response_format else [])
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _persists(backend: Backend) -> bool:
+    # Cache keys name the preferred backend's model: a failover answer from
+    # another model must not stand in for it for days
+    return backend is router.backends[0]
 
-GROQ_BASE_URL = "https://api.groq.com/openai/v1/chat/completions"
-GROQ_MODEL = "qwen/qwen3-32b"  
 
-def _groq_chat(prompt: str) -> str:
-    """Core chat function - NO THINKING enabled."""
+def cache_stats() -> dict:
+    """Hit/miss counters of the LLM response cache."""
+    stats = _response_cache.stats()
+    stats["coalesced"] = _inflight.coalesced
+    stats["semantic"] = _recommend_cache.stats()
+    return stats
+
+
+class _ThinkFilter:
+    """Incrementally drop <think>...</think> blocks from streamed text.
+
+    Partial tags at the end of a chunk are held back until the next chunk
+    arrives, so the failsafe also works across chunk boundaries.
+    """
+
+    OPEN = "<think>"
+    CLOSE = "</think>"
+    STRAY = ("</think>", "**Think**")
+
+    def __init__(self):
+        self._buf = ""
+        self._inside = False
+        self._started = False
+
+    @staticmethod
+    def _partial_suffix(text: str, markers) -> int:
+        """Length of the longest suffix of text that starts one of markers."""
+        for size in range(min(len(text), max(len(m) for m in markers) - 1), 0, -1):
+            tail = text[-size:]
+            if any(m.startswith(tail) for m in markers):
+                return size
+        return 0
+
+    def feed(self, text: str) -> str:
+        self._buf += text
+        out = []
+        while True:
+            if self._inside:
+                idx = self._buf.find(self.CLOSE)
+                if idx < 0:
+                    hold = self._partial_suffix(self._buf, (self.CLOSE,))
+                    self._buf = self._buf[len(self._buf) - hold:]
+                    break
+                self._buf = self._buf[idx + len(self.CLOSE):]
+                self._inside = False
+            else:
+                idx = self._buf.find(self.OPEN)
+                if idx >= 0:
+                    out.append(self._buf[:idx])
+                    self._buf = self._buf[idx + len(self.OPEN):]
+                    self._inside = True
+                    continue
+                for marker in self.STRAY:
+                    self._buf = self._buf.replace(marker, "")
+                hold = self._partial_suffix(self._buf, (self.OPEN,) + self.STRAY)
+                out.append(self._buf[:len(self._buf) - hold])
+                self._buf = self._buf[len(self._buf) - hold:]
+                break
+        return self._emit("".join(out))
+
+    def flush(self) -> str:
+        rest = "" if self._inside else self._buf
+        self._buf = ""
+        return self._emit(rest)
+
+    def _emit(self, text: str) -> str:
+        if not self._started:
+            text = text.lstrip()
+            self._started = bool(text)
+        return text
+
+
+def _strip_think(text: str) -> str:
+    think = _ThinkFilter()
+    return (think.feed(text) + think.flush()).strip()
+
+
+def _build_payload(
+    prompt: str,
+    temperature: float,
+    top_p: float,
+    max_tokens: int,
+    stream: bool,
+    response_format: Optional[dict] = None,
+) -> dict:
     # Disable thinking completely
-    no_think_prompt = f"""/no_think
-/no reasoning
-Direct, concise answer only. No explanations, steps, or <think> tags.
-
-/prompt/
-{prompt}"""
-    
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json",
-    }
     payload = {
         "model": GROQ_MODEL,
-        "messages": [{"role": "user", "content": no_think_prompt}],
-        "temperature": 0.1,  # Consistent, direct responses
-        "top_p": 0.8,
-        "stream": False,
-        "max_tokens": 1500,  # Limit for diet plans
+        "messages": [{"role": "user", "content": prompts.render("preamble", prompt=prompt)}],
+        "temperature": temperature,  # Consistent, direct responses
+        "top_p": top_p,
+        "stream": stream,
+        "max_tokens": max_tokens,  # Also what the rate limiter reserves
     }
-    
+    if response_format:
+        payload["response_format"] = response_format
+    return payload
+
+
+def _cached(key: str, task: str) -> Optional[str]:
+    cached = _response_cache.get(key)
+    outcome = "hit" if cached is not None else "miss"
+    metrics.inc("cf_llm_cache_total", task=task, cache="responses", outcome=outcome)
+    return cached
+
+
+def _reserve_tokens(payload: dict) -> int:
+    """Tokens a call may use: estimated prompt size plus the completion cap."""
+    prompt = payload["messages"][0]["content"]
+    return prompts.estimate_tokens(prompt) + payload["max_tokens"]
+
+
+def _admit(backend: Backend, payload: dict, task: str) -> int:
+    """Wait for the rate limiter if the backend has quotas; returns tokens reserved."""
+    reserved = 0
+    if backend.rate_limited:
+        reserved = _reserve_tokens(payload)
+        limiter.acquire(reserved, task)
+    admitted = _admitted.get()
+    if admitted is not None and not admitted:
+        admitted.append(time.perf_counter())
+    return reserved
+
+
+def _settle(
+    backend: Backend, reserved: int, usage: Optional[dict], failed: bool = False
+) -> None:
+    if backend.rate_limited:
+        limiter.settle(reserved, usage, failed)
+
+
+def _record(backend: Backend, seconds: float, error: Optional[Exception]) -> None:
+    # Running out of the caller's budget says nothing about the backend's health
+    if error is not None and deadline.expired():
+        return
+    router.record(backend, seconds, ok=error is None)
+
+
+def _report(admitted: List[float], error: Optional[Exception], end: Optional[float] = None) -> None:
+    """Feed the breaker the time since the first attempt was admitted upstream.
+
+    Waiting in our own rate limiter says nothing about the backend, so a
+    call that never got past it (e.g. a queue timeout) is not counted.
+    """
+    # A missed deadline is a slow call for the breaker, not a failed one
+    ok = error is None or isinstance(error, DeadlineExceeded)
+    if admitted:
+        breaker.record((end or time.perf_counter()) - admitted[0], ok=ok)
+    elif ok:
+        breaker.cancel()
+    else:
+        breaker.record(0.0, ok=False)
+
+
+def _retry_counter(task: str):
+    return lambda: metrics.inc("cf_llm_retries_total", task=task)
+
+
+def _retries(index: int, backends: List[Backend]) -> int:
+    # One retry (honouring Retry-After) before failing over, so a single 429
+    # doesn't send the call to the next backend; the last gets them all
+    return MAX_RETRIES if index == len(backends) - 1 else min(1, MAX_RETRIES)
+
+
+def _error_text(error: Exception, network=requests.exceptions.RequestException) -> str:
+    """User-facing reason; ``network`` is the HTTP client's transport error type."""
+    if isinstance(error, LLMUnavailable):
+        return str(error)
+    if isinstance(error, network):
+        return f"API Error (check key/internet): {str(error)[:100]}"
+    return f"Response Error: {str(error)}"
+
+
+def _unavailable(error: Exception, network=requests.exceptions.RequestException) -> Exception:
+    """Typed error to raise once every backend failed with ``error``."""
+    if deadline.expired():
+        return DeadlineExceeded("LLM time budget exceeded")
+    return LLMUnavailable(_error_text(error, network))
+
+
+@contextmanager
+def _guarded() -> Iterator[None]:
+    """Admit a call through the circuit breaker and report how it went.
+
+    Anything other than the typed errors still counts as a failure and is
+    re-raised as LLMUnavailable. Used by the sync and async clients.
+    """
+    breaker.allow()
+    admitted = []
+    token = _admitted.set(admitted)
+    error = None
+    try:
+        yield
+    except (DeadlineExceeded, LLMUnavailable) as e:
+        error = e
+        raise
+    except Exception as e:
+        error = e
+        raise LLMUnavailable(_error_text(e)) from e
+    finally:
+        _admitted.reset(token)
+        _report(admitted, error)
+
+
+def _parse_completion(data: dict) -> Tuple[str, Optional[dict]]:
+    """(content, usage) of a non-streaming chat completion."""
+    # Strip any remaining think blocks (failsafe)
+    return _strip_think(data["choices"][0]["message"]["content"]), data.get("usage")
+
+
+def _finish(
+    backend: Backend,
+    task: str,
+    start: float,
+    reserved: int,
+    usage: Optional[dict],
+    error: Optional[Exception],
+) -> None:
+    """Bookkeeping after one non-streaming call to one backend."""
+    seconds = time.perf_counter() - start
+    metrics.record_call(task, seconds, usage=usage, error=error)
+    _record(backend, seconds, error)
+    _settle(backend, reserved, usage, failed=error is not None)
+    if error is None:
+        hedging.observe(task, seconds)
+
+
+def _groq_chat(
+    prompt: str,
+    temperature: float = 0.1,
+    top_p: float = 0.8,
+    max_tokens: int = 1500,
+    task: str = "chat",
+    response_format: Optional[dict] = None,
+) -> str:
+    """Core chat function - NO THINKING enabled.
+
+    ``task`` names the calling entry point for metrics. ``response_format``
+    is passed through to the API, e.g. ``JSON_MODE``. Raises
+    LLMUnavailable if no backend answered (CircuitOpen, without trying,
+    while the circuit breaker is open) and DeadlineExceeded if the
+    caller's deadline (utils.deadline) passes.
+    """
+    key = _cache_key(prompt, temperature, top_p, max_tokens, response_format)
+    cached = _cached(key, task)
+    if cached is not None:
+        return cached
+
+    payload = _build_payload(
+        prompt, temperature, top_p, max_tokens, stream=False, response_format=response_format
+    )
+    call, leader = _inflight.acquire(key)
+    if not leader:
+        try:
+            content = call.wait(deadline.remaining())
+        except TimeoutError as e:
+            # Waited on another session's call past our deadline
+            raise DeadlineExceeded(str(e)) from e
+        if content is not None:
+            return content
+        # The leader was a stream that failed or was abandoned: fetch ourselves
+        return _fetch_chat(key, payload, task)
+
     try:
-        resp = requests.post(GROQ_BASE_URL, headers=headers, json=payload, timeout=30)
+        content = _fetch_chat(key, payload, task)
+    except BaseException as e:
+        _inflight.release(key, call, error=e)
+        raise
+    _inflight.release(key, call, result=content)
+    return content
+
+
+def _fetch_chat(key: str, payload: dict, task: str) -> str:
+    with _guarded():
+        content, backend = _fetch_any(payload, task)
+    if content and _persists(backend):
+        _response_cache.set(key, content)
+    return content
+
+
+def _fetch_any(payload: dict, task: str) -> Tuple[str, Backend]:
+    """Try backends in router order until one answers: (content, backend)."""
+    backends = router.order(queued=limiter.depth())
+    hedge_after = hedging.hedge_delay(task)
+    for i, backend in enumerate(backends):
+        deadline.check()
+        if i == 0 and hedge_after is not None:
+            backend, content, error = _fetch_hedged(backends, payload, task, hedge_after)
+        else:
+            content, error = _fetch_from(backend, payload, task, _retries(i, backends))
+        if error is None:
+            return content, backend
+    raise _unavailable(error) from error
+
+
+def _in_context(fn, *args):
+    """Submit fn to the shared pool, carrying over the caller's deadline."""
+    return get_executor().submit(contextvars.copy_context().run, fn, *args)
+
+
+def _fetch_hedged(
+    backends: List[Backend], payload: dict, task: str, hedge_after: float
+) -> Tuple[Backend, Optional[str], Optional[Exception]]:
+    """First attempt with a backup request if it outlives ``hedge_after`` seconds.
+
+    Returns (backend, content, error) of the attempt that decided. The
+    backup goes to the second backend if there is one; the first
+    successful answer wins and the slower request is left to finish
+    unobserved.
+    """
+    retries = _retries(0, backends)
+    primary = _in_context(_fetch_from, backends[0], payload, task, retries)
+    left = deadline.remaining()
+    try:
+        return (backends[0],) + primary.result(
+            timeout=hedge_after if left is None else min(hedge_after, left)
+        )
+    except FutureTimeout:
+        pass
+    if deadline.expired() or not hedging.try_spend():
+        try:
+            return (backends[0],) + primary.result(timeout=deadline.remaining())
+        except FutureTimeout as e:
+            raise DeadlineExceeded("LLM time budget exceeded") from e
+
+    metrics.inc("cf_llm_hedges_total", task=task)
+    backup = backends[1] if len(backends) > 1 else backends[0]
+    hedge = _in_context(_fetch_from, backup, payload, task, retries)
+    error = None
+    try:
+        for future in as_completed((primary, hedge), timeout=deadline.remaining()):
+            content, error = future.result()
+            if error is None:
+                if future is hedge:
+                    metrics.inc("cf_llm_hedge_wins_total", task=task)
+                    return backup, content, None
+                return backends[0], content, None
+    except FutureTimeout as e:
+        raise DeadlineExceeded("LLM time budget exceeded") from e
+    return backends[0], None, error
+
+
+def _fetch_from(
+    backend: Backend, payload: dict, task: str, max_retries: int
+) -> Tuple[Optional[str], Optional[Exception]]:
+    """One non-streaming call to one backend: (content, None) or (None, error)."""
+    reserved = _admit(backend, payload, task)
+    start = time.perf_counter()
+    usage = None
+    error = None
+    content = None
+    try:
+        resp = post_with_retry(
+            backend.url,
+            headers=backend.headers(),
+            json=backend.payload(payload),
+            timeout=backend.timeout,
+            max_retries=max_retries,
+            on_retry=_retry_counter(task),
+        )
+        resp.raise_for_status()
+        content, usage = _parse_completion(resp.json())
+    except (
+        requests.exceptions.RequestException, LLMUnavailable, KeyError, IndexError, ValueError
+    ) as e:
+        error = e
+    finally:
+        _finish(backend, task, start, reserved, usage, error)
+    return content, error
+
+
+def _open_stream(payload: dict, task: str) -> Tuple[Backend, requests.Response, int, float]:
+    """Connect to the first backend that answers 2xx: (backend, response, reserved, start).
+
+    Failed attempts are recorded here; the last error is raised if every
+    backend fails.
+    """
+    backends = router.order(queued=limiter.depth())
+    hedge_after = hedging.hedge_delay(task, stream=True)
+    for i, backend in enumerate(backends):
+        try:
+            if i == 0 and hedge_after is not None:
+                return _connect_hedged(backends, payload, task, hedge_after)
+            return (backend,) + _connect(backend, payload, task, _retries(i, backends))
+        except (requests.exceptions.RequestException, LLMUnavailable):
+            if i == len(backends) - 1 or deadline.expired():
+                raise
+
+
+def _connect(
+    backend: Backend, payload: dict, task: str, max_retries: int
+) -> Tuple[requests.Response, int, float]:
+    """Open a stream on one backend: (response, reserved, start).
+
+    Failures are recorded here and re-raised.
+    """
+    reserved = _admit(backend, payload, task)
+    start = time.perf_counter()
+    try:
+        resp = post_with_retry(
+            backend.url,
+            headers=backend.headers(),
+            json=backend.payload(payload),
+            stream=True,
+            timeout=backend.timeout,
+            max_retries=max_retries,
+            on_retry=_retry_counter(task),
+        )
+        if resp.ok:
+            hedging.observe(task, time.perf_counter() - start, stream=True)
+            return resp, reserved, start
+        resp.close()
         resp.raise_for_status()
-        content = resp.json()["choices"][0]["message"]["content"].strip()
-        
-        # Strip any remaining think tags (failsafe)
-        content = content.replace("<think>", "").replace("</think>", "").replace("**Think**", "").strip()
-        return content
-    except requests.exceptions.RequestException as e:
-        return f"API Error (check key/internet): {str(e)[:100]}"
-    except (KeyError, IndexError) as e:
-        return f"Response Error: {str(e)}"
+    except (requests.exceptions.RequestException, LLMUnavailable) as e:
+        seconds = time.perf_counter() - start
+        metrics.record_call(task, seconds, error=e)
+        _record(backend, seconds, e)
+        _settle(backend, reserved, None, failed=True)
+        raise
+
+
+def _discard_stream(backend: Backend, future) -> None:
+    """Close the response of a connection that lost the hedge race."""
+    if future.cancelled() or future.exception() is not None:
+        return
+    resp, reserved, _ = future.result()
+    resp.close()
+    # Closed before reading a token: nothing was used
+    _settle(backend, reserved, None, failed=True)
+
+
+def _connect_hedged(
+    backends: List[Backend], payload: dict, task: str, hedge_after: float
+) -> Tuple[Backend, requests.Response, int, float]:
+    """_connect with a backup connection if the first byte takes over ``hedge_after`` seconds.
+
+    Only the connection is hedged: once tokens flow the answer can't switch
+    models. The losing connection is closed as soon as it completes.
+    """
+    retries = _retries(0, backends)
+    contenders = {_in_context(_connect, backends[0], payload, task, retries): backends[0]}
+    primary = next(iter(contenders))
+    left = deadline.remaining()
+    done, _ = wait(contenders, timeout=hedge_after if left is None else min(hedge_after, left))
+    if not done and not deadline.expired() and hedging.try_spend():
+        metrics.inc("cf_llm_hedges_total", task=task)
+        backup = backends[1] if len(backends) > 1 else backends[0]
+        contenders[_in_context(_connect, backup, payload, task, retries)] = backup
+
+    error = None
+    winner = None
+    try:
+        for future in as_completed(contenders, timeout=deadline.remaining()):
+            try:
+                resp, reserved, start = future.result()
+            except (requests.exceptions.RequestException, LLMUnavailable) as e:
+                error = e
+                continue
+            winner = future
+            if future is not primary:
+                metrics.inc("cf_llm_hedge_wins_total", task=task)
+            return contenders[future], resp, reserved, start
+    except FutureTimeout as e:
+        raise DeadlineExceeded("LLM time budget exceeded") from e
+    finally:
+        for future, backend in contenders.items():
+            if future is not winner:
+                future.add_done_callback(partial(_discard_stream, backend))
+    raise error
+
+
+def _iter_sse_deltas(resp: requests.Response, meta: dict) -> Iterator[str]:
+    """Yield content deltas from an OpenAI-style SSE chat completion stream.
+
+    The token ``usage`` block, if the stream carries one, is stored in meta.
+    """
+    for line in resp.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            break
+        chunk = json.loads(data)
+        usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage")
+        if usage:
+            meta["usage"] = usage
+        choices = chunk.get("choices") or []
+        if choices:
+            delta = choices[0].get("delta", {}).get("content")
+            if delta:
+                yield delta
+
+
+def _groq_chat_stream(
+    prompt: str,
+    temperature: float = 0.1,
+    top_p: float = 0.8,
+    max_tokens: int = 1500,
+    task: str = "chat",
+) -> Iterator[str]:
+    """Streaming variant of _groq_chat: yields text as tokens arrive.
+
+    Raises LLMUnavailable or DeadlineExceeded like _groq_chat, possibly
+    after some text has been yielded.
+    """
+    key = _cache_key(prompt, temperature, top_p, max_tokens)
+    cached = _cached(key, task)
+    if cached is not None:
+        yield cached
+        return
+
+    call, leader = _inflight.acquire(key)
+    if not leader:
+        # Another session is already streaming this prompt: wait for it
+        try:
+            shared = call.wait(deadline.remaining())
+        except TimeoutError as e:
+            raise DeadlineExceeded(str(e)) from e
+        if shared is None:
+            # It failed or was abandoned: fetch ourselves
+            shared = _groq_chat(prompt, temperature, top_p, max_tokens, task)
+        yield shared
+        return
+
+    payload = _build_payload(prompt, temperature, top_p, max_tokens, stream=True)
+    think = _ThinkFilter()
+    parts = []
+    content = None
+    meta = {}
+    error = None
+    backend = None
+    admitted = None
+    first_byte = None
+
+    try:
+        breaker.allow()
+        admitted = []
+        # Set only while connecting: the generator's context is the caller's
+        token = _admitted.set(admitted)
+        try:
+            # Fail over only before the first byte: a started answer can't switch models
+            backend, resp, reserved, start = _open_stream(payload, task)
+        finally:
+            _admitted.reset(token)
+        first_byte = time.perf_counter()
+        with resp:
+            for delta in _iter_sse_deltas(resp, meta):
+                # Socket timeouts only bound each read; this bounds the whole answer
+                deadline.check()
+                text = think.feed(delta)
+                if text:
+                    if not parts:
+                        metrics.observe("cf_llm_ttft_seconds", time.perf_counter() - start, task=task)
+                    parts.append(text)
+                    yield text
+        tail = think.flush()
+        if tail:
+            parts.append(tail)
+            yield tail
+        content = "".join(parts).strip()
+        if content and _persists(backend):
+            _response_cache.set(key, content)
+    except (DeadlineExceeded, LLMUnavailable) as e:
+        error = e
+        raise
+    except Exception as e:
+        if deadline.expired():
+            # A socket timeout cut short by the deadline: not a backend failure
+            error = DeadlineExceeded("LLM time budget exceeded")
+            raise error from e
+        error = e
+        raise LLMUnavailable(_error_text(e)) from e
+    finally:
+        if admitted is not None:
+            # Streams are judged by time to the first byte, not answer length
+            _report(admitted, error, end=first_byte)
+        if backend is not None:
+            seconds = time.perf_counter() - start
+            metrics.record_call(task, seconds, usage=meta.get("usage"), error=error)
+            _record(backend, seconds, error)
+            _settle(backend, reserved, meta.get("usage"), failed=error is not None)
+        # Followers retry on their own if the stream failed or was abandoned
+        _inflight.release(key, call, result=content)
+
+
+def _pose_info_prompt(pose: str) -> str:
+    return prompts.render("pose_info", pose=pose)
+
 
 def get_pose_info(pose: str) -> str:
     """Get detailed info for a specific pose."""
-    prompt = f"""Yoga expert: For '{pose}' provide ONLY:
+    return _groq_chat(
+        _pose_info_prompt(pose), max_tokens=POSE_INFO_MAX_TOKENS, task="get_pose_info"
+    )
+
+
+def get_pose_info_stream(pose: str) -> Iterator[str]:
+    """Streaming variant of get_pose_info."""
+    return _groq_chat_stream(
+        _pose_info_prompt(pose), max_tokens=POSE_INFO_MAX_TOKENS, task="get_pose_info"
+    )
+
+
+def _pose_predictor_prompt(problem: str) -> str:
+    return prompts.render("pose_predictor", problem=problem)
+
+
+def pose_predictor(problem: str) -> str:
+    """Recommend poses for the user's problem, passed as raw text."""
+    return _groq_chat(_pose_predictor_prompt(problem), task="pose_predictor")
+
 
-1. **Key Benefits** (3-4 bullets)
-2. **Steps** (3-4 numbered steps, beginner)
-3. **Duration**: 30-60s hold
+def pose_predictor_stream(problem: str) -> Iterator[str]:
+    """Streaming variant of pose_predictor."""
+    return _groq_chat_stream(_pose_predictor_prompt(problem), task="pose_predictor")
 
-Concise, accurate."""
-    return _groq_chat(prompt)
 
-def pose_predictor(condition: str) -> str:
-    """Recommend poses for user condition/problem."""
-    prompt = f"""Yoga therapist: For condition '{condition}' recommend 2-3 beginner poses.
+def recommend_poses(problem: str) -> List[PoseRecommendation]:
+    """Typed pose recommendations for the user's problem (JSON mode).
 
-Format:
-**Pose 1**: Benefits. Steps: 1.2.3.
-**Pose 2**: ...
+    Returns an empty list if the API call failed or ran past the caller's
+    deadline. Replies that are not valid JSON are parsed as the Markdown
+    layout of pose_predictor. Answers are reused for sufficiently similar
+    problem texts.
+    """
+    text = _recommend_cache.get(problem)
+    outcome = "hit" if text is not None else "miss"
+    metrics.inc("cf_llm_cache_total", task="pose_predictor", cache="semantic", outcome=outcome)
+    if text is not None:
+        return parse_recommendations(text)
+
+    try:
+        text = _groq_chat(
+            prompts.render("pose_predictor_json", problem=problem),
+            max_tokens=RECOMMEND_MAX_TOKENS,
+            task="pose_predictor",
+            response_format=JSON_MODE,
+        )
+    except (DeadlineExceeded, LLMUnavailable):
+        return []
+    recommendations = parse_recommendations(text)
+    if recommendations:
+        _recommend_cache.set(problem, text)
+    return recommendations
+
+
+def _diet_notes_prompt(plan: diet_engine.DietPlan) -> str:
+    dishes = sorted({meal.dish for day in plan.days for meal in day.meals})
+    return prompts.render(
+        "diet_notes",
+        diet_type=plan.diet_type,
+        goal=plan.goal,
+        target_kcal=plan.target_kcal,
+        activity_level=plan.activity_level,
+        dishes=", ".join(dishes),
+    )
+
+
+def _diet_bucket(
+    age, gender, weight_kg, height_cm, goal, diet_type, activity_level, use_ai
+):
+    profile = diet_engine.quantize_profile(
+        age, gender, weight_kg, height_cm, goal, diet_type, activity_level
+    )
+    key = diet_engine.bucket_key(dict(profile, use_ai=use_ai))
+    return profile, key
+
+
+def _diet_plan_cached(key: str) -> Optional[str]:
+    cached = _diet_cache.get(key)
+    outcome = "hit" if cached is not None else "miss"
+    metrics.inc("cf_llm_cache_total", task="generate_diet_plan", cache="diet_plans", outcome=outcome)
+    return cached
 
-Safe, effective only."""
-    return _groq_chat(prompt)
 
 def generate_diet_plan(
     age: int,
@@ -73,16 +763,98 @@ def generate_diet_plan(
     goal: str,
     diet_type: str = "balanced",
     activity_level: str = "moderate",
+    use_ai: bool = True,
 ) -> str:
-    """Generate 3-day repeatable diet plan."""
-    prompt = f"""Certified nutritionist: Create 3-day Indian-style diet plan for:
-Age: {age}, {gender}, {weight_kg}kg, {height_cm}cm
-Goal: {goal}, Diet: {diet_type}, Activity: {activity_level}
-
-Per day (Breakfast/Lunch/Snack/Dinner):
-- Dish + rough calories
-Variety, healthy, realistic foods.
-
-End with Daily Notes (water, tip).
-Markdown. No medical claims."""
-    return _groq_chat(prompt)
+    """Generate 3-day repeatable diet plan.
+
+    Calories and meals come from the local diet engine; the LLM only
+    writes the short Daily Notes section when ``use_ai`` is set. Plans
+    are cached per profile bucket (see diet_engine.BUCKET_WIDTHS).
+    """
+    profile, key = _diet_bucket(
+        age, gender, weight_kg, height_cm, goal, diet_type, activity_level, use_ai
+    )
+    cached = _diet_plan_cached(key)
+    if cached is not None:
+        return cached
+
+    plan = diet_engine.build_plan(**profile)
+    notes = diet_engine.DEFAULT_NOTES
+    cacheable = True
+    if use_ai:
+        try:
+            ai_notes = _groq_chat(
+                _diet_notes_prompt(plan),
+                max_tokens=DIET_NOTES_MAX_TOKENS,
+                task="generate_diet_plan",
+            )
+        except (DeadlineExceeded, LLMUnavailable):
+            ai_notes = ""
+        if ai_notes:
+            notes = ai_notes
+        else:
+            cacheable = False
+    text = f"{diet_engine.to_markdown(plan)}\n\n{notes}"
+    if cacheable:
+        _diet_cache.set(key, text)
+    return text
+
+
+def generate_diet_plan_stream(
+    age: int,
+    gender: str,
+    weight_kg: float,
+    height_cm: float,
+    goal: str,
+    diet_type: str = "balanced",
+    activity_level: str = "moderate",
+    use_ai: bool = True,
+) -> Iterator[str]:
+    """Streaming variant of generate_diet_plan: the plan first, then the notes."""
+    profile, key = _diet_bucket(
+        age, gender, weight_kg, height_cm, goal, diet_type, activity_level, use_ai
+    )
+    cached = _diet_plan_cached(key)
+    if cached is not None:
+        yield cached
+        return
+
+    plan = diet_engine.build_plan(**profile)
+    head = f"{diet_engine.to_markdown(plan)}\n\n"
+    yield head
+    if not use_ai:
+        yield diet_engine.DEFAULT_NOTES
+        _diet_cache.set(key, head + diet_engine.DEFAULT_NOTES)
+        return
+
+    parts = []
+    notes_stream = _groq_chat_stream(
+        _diet_notes_prompt(plan),
+        max_tokens=DIET_NOTES_MAX_TOKENS,
+        task="generate_diet_plan",
+    )
+    try:
+        for chunk in notes_stream:
+            parts.append(chunk)
+            yield chunk
+    except (DeadlineExceeded, LLMUnavailable):
+        # The plan itself is complete; only the notes are missing or cut
+        if not parts:
+            yield diet_engine.DEFAULT_NOTES
+        return
+    notes = "".join(parts).strip()
+    if not notes:
+        # An empty reply is not worth caching; show the standard notes instead
+        yield diet_engine.DEFAULT_NOTES
+        return
+    _diet_cache.set(key, head + notes)
+
+
+def diet_cache_stats() -> dict:
+    """Hit/miss counters of the per-bucket diet plan cache."""
+    return _diet_cache.stats()
+
+
+def metrics_text() -> str:
+    """Prometheus-style text for all LLM client metrics."""
+    return metrics.render_prometheus()
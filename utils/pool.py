@@ -0,0 +1,21 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Shared by all sessions; I/O-bound work only (HTTP lookups)
+MAX_WORKERS = int(os.environ.get("CF_POOL_WORKERS", "16"))
+
+_executor = None
+_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Process-wide thread pool for running page lookups in parallel."""
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=MAX_WORKERS, thread_name_prefix="cf-io"
+                )
+    return _executor
@@ -0,0 +1,103 @@
+import json
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "poses.json")
+
+
+@dataclass(frozen=True)
+class Pose:
+    name: str
+    sanskrit: str
+    aliases: Tuple[str, ...]
+    benefits: str
+    level: str
+    duration: str
+    steps: Tuple[str, ...]
+
+    @property
+    def title(self) -> str:
+        if self.sanskrit.lower() == self.name.lower():
+            return self.name
+        return f"{self.sanskrit} ({self.name})"
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Canonical name, Sanskrit name and aliases."""
+        return (self.name, self.sanskrit) + self.aliases
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase and drop everything but letters and digits."""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def _keys(name: str) -> List[str]:
+    key = normalize_name(name)
+    keys = [key]
+    # "Tree" and "Tree Pose" should resolve to the same entry
+    if key.endswith("pose") and len(key) > 4:
+        keys.append(key[:-4])
+    return keys
+
+
+def _load(path: str) -> Tuple[List[Pose], Dict[str, Pose]]:
+    with open(path, encoding="utf-8") as f:
+        rows = json.load(f)
+
+    poses = []
+    index: Dict[str, Pose] = {}
+    for row in rows:
+        pose = Pose(
+            name=row["name"],
+            sanskrit=row["sanskrit"],
+            aliases=tuple(row.get("aliases", ())),
+            benefits=row["benefits"],
+            level=row["level"],
+            duration=row["duration"],
+            steps=tuple(row.get("steps", ())),
+        )
+        poses.append(pose)
+
+    # Canonical and Sanskrit names first, then aliases, so an alias on one
+    # entry never shadows another entry's own name
+    for pose in poses:
+        _index(index, pose, (pose.name, pose.sanskrit))
+    for pose in poses:
+        _index(index, pose, pose.aliases)
+    return poses, index
+
+
+def _index(index: Dict[str, Pose], pose: Pose, names: Tuple[str, ...]) -> None:
+    for name in names:
+        for key in _keys(name):
+            # Within a pass the earlier entry wins
+            index.setdefault(key, pose)
+
+
+# Loaded once per process; every lookup is a dict hit
+POSES, _ALIAS_INDEX = _load(DATA_PATH)
+
+
+def lookup(name: str) -> Optional[Pose]:
+    """Exact (normalized) lookup by English name, Sanskrit name or alias."""
+    for key in _keys(name):
+        pose = _ALIAS_INDEX.get(key)
+        if pose is not None:
+            return pose
+    return None
+
+
+def to_markdown(pose: Pose) -> str:
+    """Render a catalog entry in the same layout as the LLM pose insights."""
+    steps = "\n".join(f"{i}. {step}" for i, step in enumerate(pose.steps, 1))
+    return f"""**{pose.title}**
+
+**Key Benefits**: {pose.benefits}
+
+**Steps**
+{steps}
+
+**Duration**: {pose.duration} · **Level**: {pose.level}"""
@@ -0,0 +1,99 @@
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from utils import pose_catalog
+from utils.pose_catalog import Pose
+
+# Minimum Dice similarity for a fuzzy match to be accepted
+MIN_SIMILARITY = 0.65
+
+# ...and how far it must beat the best different pose
+MIN_MARGIN = 0.1
+
+# "-asana" (and its usual misspellings) or "pose": shared by most names, so
+# left in they make unrelated poses look alike
+_SUFFIX = re.compile(r"(?:pose|a?sa?n+a?)$")
+
+_ROMAN = {"1": "I", "2": "II", "3": "III"}
+
+
+def _stem(key: str) -> str:
+    stem = _SUFFIX.sub("", key)
+    return stem if len(stem) >= 3 else key
+
+
+def _numeral(key: str) -> str:
+    match = re.search(r"i{1,3}$", key)
+    return match.group(0) if match else ""
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _build_index() -> Tuple[List[Tuple[str, Pose, Set[str]]], Dict[str, List[int]]]:
+    entries = []
+    postings: Dict[str, List[int]] = defaultdict(list)
+    for key, pose in pose_catalog._ALIAS_INDEX.items():
+        grams = _trigrams(_stem(key))
+        for gram in grams:
+            postings[gram].append(len(entries))
+        entries.append((key, pose, grams))
+    return entries, dict(postings)
+
+
+# Trigram inverted index over every canonical name and alias
+_ENTRIES, _POSTINGS = _build_index()
+
+
+@lru_cache(maxsize=4096)
+def resolve(name: str) -> Optional[Pose]:
+    """Map free-form / misspelled input to a catalog pose, or None."""
+    # "Virabhadrasana 2" -> "Virabhadrasana II"
+    name = re.sub(r"\b([123])\b", lambda m: _ROMAN[m.group(1)], name)
+    pose = pose_catalog.lookup(name)
+    if pose is not None:
+        return pose
+
+    key = pose_catalog.normalize_name(name)
+    if len(key) < 3:
+        return None
+
+    # "Warrior II" and "Warrior III" differ by one trigram: match numerals exactly
+    numeral = re.search(r"\b(I{1,3})\s*$", name, re.IGNORECASE)
+    numeral = numeral.group(1).lower() if numeral else None
+
+    query = _trigrams(_stem(key))
+    shared: Dict[int, int] = defaultdict(int)
+    for gram in query:
+        for idx in _POSTINGS.get(gram, ()):
+            if numeral is None or _numeral(_ENTRIES[idx][0]) == numeral:
+                shared[idx] += 1
+
+    # Best score per pose, so a pose's own aliases never count as rivals
+    scores: Dict[str, Tuple[float, Pose]] = {}
+    for idx, count in shared.items():
+        pose = _ENTRIES[idx][1]
+        score = 2.0 * count / (len(query) + len(_ENTRIES[idx][2]))
+        if score > scores.get(pose.name, (0.0,))[0]:
+            scores[pose.name] = (score, pose)
+    ranked = sorted(scores.values(), key=lambda item: item[0], reverse=True)
+    if not ranked or ranked[0][0] < MIN_SIMILARITY:
+        return None
+    if len(ranked) > 1 and ranked[0][0] - ranked[1][0] < MIN_MARGIN:
+        return None
+    return ranked[0][1]
+
+
+def canonical_name(name: str) -> str:
+    """Canonical pose name for the input, or the cleaned input if unknown.
+
+    Used as the key for video lookups and LLM prompts so spelling variants
+    of the same pose share one cache entry.
+    """
+    name = " ".join(name.split())
+    pose = resolve(name)
+    return pose.name if pose is not None else name
@@ -0,0 +1,112 @@
+"""Batch-generate pose insights ahead of time.
+
+Usage:
+    python -m utils.prewarm "Scorpion Pose" "Flying Pigeon" ...
+    python -m utils.prewarm --file poses.txt --concurrency 4 --rate 1.0
+    python -m utils.prewarm --base-url http://127.0.0.1:8000/v1/chat/completions Vrischikasana
+
+Results are written to the durable insight store that pages/info.py reads
+before calling the LLM. Poses in the local catalog are skipped, since the
+page answers those from the catalog.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from typing import List
+
+from utils import async_client, insight_store
+from utils.circuit_breaker import LLMUnavailable
+from utils.llm_backends import router
+from utils.pose_resolver import canonical_name, resolve
+
+
+class _RateLimiter:
+    """Spaces out request starts to at most ``rate`` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._lock = asyncio.Lock()
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+            self._next = max(now, self._next) + self.interval
+
+
+async def prewarm(
+    poses: List[str], concurrency: int = 4, rate: float = 1.0, force: bool = False
+) -> dict:
+    """Fetch and store insights for every pose not already in the store.
+
+    Catalog poses are skipped: pages/info.py serves those from the catalog
+    and never reads the store for them.
+    """
+    todo = []
+    for pose in dict.fromkeys(canonical_name(p) for p in poses if p.strip()):
+        if resolve(pose) is not None:
+            print(f"  - {pose}: in the pose catalog")
+            continue
+        if force or insight_store.get_insight(pose) is None:
+            todo.append(pose)
+
+    limiter = _RateLimiter(rate)
+    summary = {"requested": len(poses), "skipped": len(poses) - len(todo), "stored": 0, "failed": []}
+
+    async def _one(client, pose):
+        await limiter.wait()
+        try:
+            text = await async_client.get_pose_info_async(client, pose)
+        except LLMUnavailable as e:
+            text, reason = "", str(e)
+        else:
+            reason = "empty response"
+        if not text:
+            summary["failed"].append(pose)
+            print(f"  ✗ {pose}: {reason[:80]}", file=sys.stderr)
+            return
+        insight_store.put_insight(pose, text)
+        summary["stored"] += 1
+        print(f"  ✓ {pose}")
+
+    async with async_client._client() as client:
+        await async_client.gather_bounded((_one(client, p) for p in todo), limit=concurrency)
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("poses", nargs="*", help="pose names to prewarm")
+    parser.add_argument("--file", help="text file with one pose name per line")
+    parser.add_argument("--concurrency", type=int, default=async_client.DEFAULT_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=1.0, help="max requests per second (0 = unlimited)")
+    parser.add_argument("--base-url", help="override the chat-completions URL (e.g. a local stub)")
+    parser.add_argument("--force", action="store_true", help="regenerate poses already stored")
+    args = parser.parse_args(argv)
+
+    poses = list(args.poses)
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            poses += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    if not poses:
+        parser.error("no poses given")
+
+    if args.base_url:
+        # Applies to the preferred backend (LLM_BACKENDS)
+        router.backends[0].url = args.base_url
+
+    summary = asyncio.run(
+        prewarm(poses, concurrency=args.concurrency, rate=args.rate, force=args.force)
+    )
+    print(
+        f"stored {summary['stored']}, skipped {summary['skipped']}, "
+        f"failed {len(summary['failed'])}"
+    )
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Versioned prompt templates for every LLM task.
+
+Templates take raw structured inputs (a pose name, the user's problem
+text, a plan summary) so pages never pre-wrap instructions themselves.
+Run ``python -m utils.prompts`` to print the estimated input tokens of
+each template rendered with its example inputs.
+"""
+import math
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    name: str
+    version: int
+    text: str
+    example: Dict[str, str] = field(default_factory=dict)
+
+    def render(self, **inputs) -> str:
+        return self.text.format(**inputs)
+
+
+_REGISTRY: Dict[str, PromptTemplate] = {}
+
+
+def register(name: str, version: int, text: str, example: Dict[str, str] = None) -> PromptTemplate:
+    template = PromptTemplate(name, version, text, example or {})
+    _REGISTRY[name] = template
+    return template
+
+
+def get(name: str) -> PromptTemplate:
+    return _REGISTRY[name]
+
+
+def render(name: str, **inputs) -> str:
+    return _REGISTRY[name].render(**inputs)
+
+
+def templates() -> Dict[str, PromptTemplate]:
+    return dict(_REGISTRY)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)."""
+    return math.ceil(len(text) / 4)
+
+
+# Wraps every task prompt; /no_think is Qwen3's switch to skip reasoning
+register("preamble", 2, "/no_think\n{prompt}", {"prompt": ""})
+
+register(
+    "pose_info",
+    2,
+    """Yoga pose: {pose}
+Markdown only:
+**Key Benefits**: 3-4 bullets
+**Steps**: 3-4 numbered beginner steps
+**Duration**: hold time""",
+    {"pose": "Downward Dog"},
+)
+
+register(
+    "pose_predictor",
+    2,
+    """Yoga therapist. User problems: {problem}
+Recommend 2-3 safe beginner poses. For each, in Markdown:
+**English name (Sanskrit)**: benefits for these problems
+Steps: 3-5 numbered
+Duration: hold time""",
+    {"problem": "lower back pain and anxiety"},
+)
+
+# JSON mode requires the word "JSON" in the prompt
+register(
+    "pose_predictor_json",
+    1,
+    """Yoga therapist. User problems: {problem}
+Recommend 2-3 safe beginner poses. Reply with JSON only:
+{{"poses": [{{"name": "English name", "sanskrit": "Sanskrit name", "benefits": "for these problems",
+"steps": ["3-5 short steps"], "duration": "hold time"}}]}}""",
+    {"problem": "lower back pain and anxiety"},
+)
+
+register(
+    "diet_notes",
+    1,
+    """Nutritionist: write "### Daily Notes" for this {diet_type} Indian diet plan.
+Goal: {goal}, ~{target_kcal} kcal/day, activity: {activity_level}.
+Dishes: {dishes}.
+
+3-4 short bullets: water, a prep tip for these dishes, one habit.
+Markdown. No medical claims.""",
+    {
+        "diet_type": "vegetarian",
+        "goal": "lose",
+        "target_kcal": "2046",
+        "activity_level": "moderate",
+        "dishes": "Paneer bhurji with 2 rotis, Moong dal chilla with mint chutney",
+    },
+)
+
+
+def token_report() -> Dict[str, int]:
+    """Estimated input tokens per template, preamble included."""
+    preamble = get("preamble")
+    return {
+        name: estimate_tokens(preamble.render(prompt=t.render(**t.example)))
+        for name, t in _REGISTRY.items()
+        if name != "preamble"
+    }
+
+
+if __name__ == "__main__":
+    for name, tokens in token_report().items():
+        t = get(name)
+        print(f"{name:<20} v{t.version}  ~{tokens} input tokens")
@@ -0,0 +1,130 @@
+"""Process-wide request shaping in front of the Groq API.
+
+Two token buckets (requests/min and tokens/min) refill continuously.
+Callers queue by priority: interactive pose lookups are admitted before
+heavy diet calls whenever both are waiting. Queue depth and wait time
+are exported through utils.metrics.
+"""
+import heapq
+import itertools
+import os
+import threading
+import time
+from typing import Optional
+
+from utils import deadline, metrics
+
+# Groq's free-tier limits for qwen3-32b; override per deployment
+REQUESTS_PER_MINUTE = float(os.environ.get("CF_GROQ_RPM", "60"))
+TOKENS_PER_MINUTE = float(os.environ.get("CF_GROQ_TPM", "6000"))
+
+# Lower is served first; unknown tasks sit in the middle
+PRIORITIES = {
+    "get_pose_info": 0,
+    "pose_predictor": 1,
+    "generate_diet_plan": 2,
+}
+DEFAULT_PRIORITY = 1
+
+
+class _Bucket:
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount: float) -> float:
+        """Seconds until ``amount`` is available (0 if it already is)."""
+        missing = amount - self.level
+        return 0.0 if missing <= 0 else missing / self.rate
+
+
+class RateLimiter:
+    """Token-bucket limiter (RPM + TPM) with a priority wait queue."""
+
+    def __init__(
+        self,
+        requests_per_minute: float = REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = TOKENS_PER_MINUTE,
+    ):
+        self._requests = _Bucket(requests_per_minute)
+        self._tokens = _Bucket(tokens_per_minute)
+        self._cond = threading.Condition()
+        self._queue = []  # (priority, seq)
+        self._seq = itertools.count()
+
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._queue)
+
+    def acquire(self, tokens: int, task: str = "chat") -> float:
+        """Block until one request and ``tokens`` tokens are available.
+
+        Returns the seconds spent waiting. Raises DeadlineExceeded (and
+        leaves the queue) if the caller's deadline passes first.
+        """
+        tokens = min(tokens, self._tokens.capacity)
+        entry = (PRIORITIES.get(task, DEFAULT_PRIORITY), next(self._seq))
+        start = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._queue, entry)
+            metrics.set_gauge("cf_llm_queue_depth", len(self._queue))
+            while True:
+                now = time.monotonic()
+                self._requests.refill(now)
+                self._tokens.refill(now)
+                left = deadline.remaining()
+                if self._queue[0] == entry:
+                    delay = max(self._requests.wait_for(1), self._tokens.wait_for(tokens))
+                    if delay <= 0:
+                        heapq.heappop(self._queue)
+                        self._requests.level -= 1
+                        self._tokens.level -= tokens
+                        metrics.set_gauge("cf_llm_queue_depth", len(self._queue))
+                        # Let the next waiter re-check the buckets
+                        self._cond.notify_all()
+                        break
+                else:
+                    delay = None
+                if left is not None:
+                    # Give up now if the buckets cannot refill within the budget
+                    if left <= 0 or (delay is not None and delay > left):
+                        self._leave(entry)
+                        metrics.inc("cf_llm_queue_timeouts_total", task=task)
+                        raise deadline.DeadlineExceeded("rate limit wait exceeds the deadline")
+                    if delay is None:
+                        delay = left
+                self._cond.wait(delay)
+        waited = time.monotonic() - start
+        metrics.observe("cf_llm_queue_wait_seconds", waited, task=task)
+        return waited
+
+    def _leave(self, entry) -> None:
+        self._queue.remove(entry)
+        heapq.heapify(self._queue)
+        metrics.set_gauge("cf_llm_queue_depth", len(self._queue))
+        self._cond.notify_all()
+
+    def settle(self, reserved: int, usage: Optional[dict], failed: bool = False) -> None:
+        """Return tokens reserved beyond what the call actually used.
+
+        A failed call that reported no usage gets its whole reservation back.
+        """
+        used = (usage or {}).get("total_tokens")
+        if used is None:
+            if not failed:
+                return
+            used = 0
+        if used >= reserved:
+            return
+        with self._cond:
+            self._tokens.level = min(self._tokens.capacity, self._tokens.level + reserved - used)
+            self._cond.notify_all()
+
+
+limiter = RateLimiter()
@@ -0,0 +1,169 @@
+import json
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from utils import pose_catalog
+from utils.semantic_cache import terms
+
+
+@dataclass
+class PoseRecommendation:
+    name: str
+    sanskrit: str = ""
+    benefits: str = ""
+    steps: List[str] = field(default_factory=list)
+    duration: str = ""
+
+    @property
+    def title(self) -> str:
+        return f"{self.name} ({self.sanskrit})" if self.sanskrit else self.name
+
+    def to_markdown(self) -> str:
+        """Same layout as pose_catalog.to_markdown, skipping missing fields."""
+        blocks = []
+        if self.benefits:
+            blocks.append(f"**Key Benefits**: {self.benefits}")
+        if self.steps:
+            steps = "\n".join(f"{i}. {step}" for i, step in enumerate(self.steps, 1))
+            blocks.append(f"**Steps**\n{steps}")
+        if self.duration:
+            blocks.append(f"**Duration**: {self.duration}")
+        return "\n\n".join(blocks)
+
+
+def _from_dict(item: dict) -> Optional[PoseRecommendation]:
+    name = str(item.get("name") or item.get("english_name") or "").strip()
+    if not name:
+        return None
+    steps = item.get("steps") or []
+    if isinstance(steps, str):
+        steps = [s for s in re.split(r"\s*\d+[.)]\s*", steps) if s.strip()]
+    benefits = item.get("benefits") or ""
+    if isinstance(benefits, list):
+        benefits = "; ".join(str(b) for b in benefits)
+    return PoseRecommendation(
+        name=name,
+        sanskrit=str(item.get("sanskrit") or item.get("sanskrit_name") or "").strip(),
+        benefits=str(benefits).strip(),
+        steps=[str(s).strip() for s in steps if str(s).strip()],
+        duration=str(item.get("duration") or "").strip(),
+    )
+
+
+def _parse_json(text: str) -> Optional[list]:
+    candidates = [text]
+    # Models sometimes wrap JSON in prose or ``` fences
+    match = re.search(r"[\[{].*[\]}]", text, re.S)
+    if match:
+        candidates.append(match.group(0))
+    for candidate in candidates:
+        try:
+            data = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(data, dict):
+            data = data.get("poses") or data.get("recommendations") or [data]
+        if isinstance(data, list):
+            return data
+    return None
+
+
+# "**Child's Pose (Balasana)**: Relieves ..." / "### 1. Cobra Pose (Bhujangasana)"
+_HEADING = re.compile(
+    r"^\s*(?:#+\s*|[-*]\s*)?(?:\d+[.)]\s*)?\*\*(?P<bold>[^*]+)\*\*\s*:?\s*(?P<rest>.*)$"
+    r"|^\s*#+\s*(?:\d+[.)]\s*)?(?P<head>.+)$"
+)
+_STEP = re.compile(r"^\s*(?:\d+[.)]|[-*])\s+(?P<step>.+)$")
+_NAME = re.compile(r"^(?P<name>[^(]+?)\s*(?:\((?P<sanskrit>[^)]+)\))?\s*$")
+
+
+def _parse_markdown(text: str) -> List[PoseRecommendation]:
+    poses: List[PoseRecommendation] = []
+    for line in text.splitlines():
+        heading = _HEADING.match(line)
+        if heading:
+            title = (heading.group("bold") or heading.group("head") or "").strip().rstrip(":")
+            label = title.lower()
+            if label.startswith(("steps", "benefits", "duration")):
+                rest = (heading.group("rest") or "").strip()
+                if poses and label.startswith("benefits"):
+                    poses[-1].benefits = rest
+                elif poses and label.startswith("duration"):
+                    poses[-1].duration = rest
+                continue
+            name = _NAME.match(title)
+            if name:
+                poses.append(
+                    PoseRecommendation(
+                        name=name.group("name").strip(),
+                        sanskrit=(name.group("sanskrit") or "").strip(),
+                        benefits=(heading.group("rest") or "").strip(),
+                    )
+                )
+            continue
+        if not poses:
+            continue
+        step = _STEP.match(line)
+        stripped = line.strip()
+        if stripped.lower().startswith("duration"):
+            poses[-1].duration = stripped.split(":", 1)[-1].strip()
+        elif stripped.lower().startswith("benefits"):
+            poses[-1].benefits = stripped.split(":", 1)[-1].strip()
+        elif step:
+            poses[-1].steps.append(step.group("step").strip())
+    return poses
+
+
+def parse_recommendations(text: str) -> List[PoseRecommendation]:
+    """Typed poses from a JSON-mode response, falling back to Markdown parsing."""
+    data = _parse_json(text)
+    if data is not None:
+        poses = [p for p in (_from_dict(i) for i in data if isinstance(i, dict)) if p]
+        if poses:
+            return poses
+    return _parse_markdown(text)
+
+
+# Complaints whose words rarely appear in the catalog's benefit texts
+_RELIEF_WORDS = {
+    "anxiety": "calm stress relax",
+    "stress": "calm relax",
+    "sleep": "calm relax",
+    "stiffness": "stretch mobility",
+    "tight": "stretch open",
+    "posture": "spine back",
+}
+
+# Keyed and valued in terms() form so lookups match the stemmed query words
+_RELIEF_TERMS = {
+    terms(complaint)[0]: tuple(terms(words)) for complaint, words in _RELIEF_WORDS.items()
+}
+
+
+def catalog_recommendations(problem: str, limit: int = 3) -> List[PoseRecommendation]:
+    """Offline picks: catalog poses whose benefits mention the problem's terms."""
+    wanted = set()
+    for term in terms(problem):
+        wanted.add(term)
+        wanted.update(_RELIEF_TERMS.get(term, ()))
+    if not wanted:
+        return []
+
+    scored = []
+    for index, pose in enumerate(pose_catalog.POSES):
+        score = len(wanted & set(terms(pose.benefits)))
+        if score:
+            # Beginner poses first on ties; catalog order after that
+            scored.append((-score, pose.level.lower() != "beginner", index, pose))
+    scored.sort(key=lambda item: item[:3])
+    return [
+        PoseRecommendation(
+            name=pose.name,
+            sanskrit=pose.sanskrit if pose.sanskrit.lower() != pose.name.lower() else "",
+            benefits=pose.benefits,
+            steps=list(pose.steps),
+            duration=pose.duration,
+        )
+        for *_, pose in scored[:limit]
+    ]
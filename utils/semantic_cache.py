@@ -0,0 +1,179 @@
+"""Similarity cache for free-text queries (CPU only, NumPy).
+
+Queries are embedded as hashed bags of normalized words and character
+trigrams, L2-normalized, so a single matrix-vector product gives the
+cosine similarity against every stored query. A stored query is only a
+candidate when it has exactly the same terms as the new one after
+synonyms and stemming; cosine then ranks the candidates. "pain in my
+lower back" and "lower back aches" reuse "lower back pain", while
+compound queries ("lower back pain and knee pain", "lower back pain and
+stress") are misses: a second condition changes the answer even though
+the vectors stay close.
+"""
+import re
+import threading
+import zlib
+from collections import Counter
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Set
+
+if TYPE_CHECKING:
+    import numpy as np
+
+DIM = 2048
+THRESHOLD = 0.85
+CAPACITY = 1000
+
+# Character trigrams catch spelling variants without outweighing whole words
+TRIGRAM_WEIGHT = 0.3
+
+_STOPWORDS = frozenset(
+    """a an and the my i me im in on of at to for with from have has having had
+    been is am are was it its this that some very really so after since due
+    because feel feeling get getting lot lots bit also when while like any""".split()
+)
+
+_SYNONYMS = {
+    "ache": "pain",
+    "aches": "pain",
+    "aching": "pain",
+    "sore": "pain",
+    "soreness": "pain",
+    "hurt": "pain",
+    "hurts": "pain",
+    "stiff": "stiffness",
+    "anxious": "anxiety",
+    "stressed": "stress",
+    "insomnia": "sleep",
+    "sleepless": "sleep",
+}
+
+_SUFFIXES = ("iness", "ness", "ing", "ed", "es", "s", "y")
+
+
+def _stem(word: str) -> str:
+    for suffix in _SUFFIXES:
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[: -len(suffix)]
+    return word
+
+
+def terms(text: str) -> List[str]:
+    """Normalized content words of a query."""
+    words = (_SYNONYMS.get(w, w) for w in re.findall(r"[a-z]+", text.lower()))
+    return [_stem(w) for w in words if w not in _STOPWORDS]
+
+
+def embed(text: str, dim: int = DIM) -> "np.ndarray":
+    """Unit-length hashed n-gram vector (all zeros if the text has no terms)."""
+    # Imported on first use so importing the LLM client stays cheap
+    import numpy as np
+
+    features = Counter()
+    for word in terms(text):
+        features["w:" + word] += 1.0
+        padded = f"#{word}#"
+        for i in range(len(padded) - 2):
+            features["c:" + padded[i:i + 3]] += TRIGRAM_WEIGHT
+
+    vec = np.zeros(dim, dtype=np.float32)
+    for feature, weight in features.items():
+        # crc32 rather than hash(): stable across processes
+        vec[zlib.crc32(feature.encode("utf-8")) % dim] += weight
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+
+class SemanticCache:
+    """Nearest-neighbour cache with a similarity threshold and LRU eviction."""
+
+    def __init__(
+        self,
+        name: str,
+        threshold: float = THRESHOLD,
+        capacity: int = CAPACITY,
+        dim: int = DIM,
+    ):
+        self.name = name
+        self.threshold = threshold
+        self.capacity = capacity
+        self.dim = dim
+        # Allocated by the first set()
+        self._vectors = None
+        self._last_used = None
+        self._values: List[Optional[str]] = []
+        self._keys: List[Optional[FrozenSet[str]]] = []
+        # Slots per term set: only these are compared with a query
+        self._by_key: Dict[FrozenSet[str], Set[int]] = {}
+        self._size = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _nearest(self, vec: "np.ndarray", slots: Set[int]):
+        idxs = list(slots)
+        scores = self._vectors[idxs] @ vec
+        best = int(scores.argmax())
+        return idxs[best], float(scores[best])
+
+    def get(self, text: str) -> Optional[str]:
+        vec = embed(text, self.dim)
+        key = frozenset(terms(text))
+        with self._lock:
+            slots = self._by_key.get(key)
+            if slots and vec.any():
+                idx, score = self._nearest(vec, slots)
+                if score >= self.threshold:
+                    self._clock += 1
+                    self._last_used[idx] = self._clock
+                    self.hits += 1
+                    return self._values[idx]
+            self.misses += 1
+        return None
+
+    def set(self, text: str, value: str) -> None:
+        vec = embed(text, self.dim)
+        if not vec.any():
+            return
+        key = frozenset(terms(text))
+        with self._lock:
+            if self._vectors is None:
+                import numpy as np
+
+                self._vectors = np.zeros((self.capacity, self.dim), dtype=np.float32)
+                self._last_used = np.zeros(self.capacity, dtype=np.int64)
+                self._values = [None] * self.capacity
+                self._keys = [None] * self.capacity
+            self._clock += 1
+            slots = self._by_key.get(key)
+            if slots:
+                idx, score = self._nearest(vec, slots)
+                if score >= 0.999:
+                    # Same query again: refresh in place
+                    self._values[idx] = value
+                    self._last_used[idx] = self._clock
+                    return
+            if self._size < self.capacity:
+                idx = self._size
+                self._size += 1
+            else:
+                idx = int(self._last_used.argmin())
+                evicted = self._by_key[self._keys[idx]]
+                evicted.discard(idx)
+                if not evicted:
+                    del self._by_key[self._keys[idx]]
+            self._vectors[idx] = vec
+            self._values[idx] = value
+            self._keys[idx] = key
+            self._by_key.setdefault(key, set()).add(idx)
+            self._last_used[idx] = self._clock
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "name": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": self._size,
+        }
@@ -0,0 +1,22 @@
+from typing import Any, Hashable, Optional
+
+import streamlit as st
+
+# session_state keys are namespaced so they never collide with widget keys
+_PREFIX = "cf_memo:"
+
+
+def recall(slot: str, query: Hashable) -> Optional[Any]:
+    """Result remembered for ``query`` in this browser session, if any.
+
+    Each slot holds only the last query, so a changed input misses.
+    """
+    entry = st.session_state.get(_PREFIX + slot)
+    if entry is not None and entry[0] == query:
+        return entry[1]
+    return None
+
+
+def remember(slot: str, query: Hashable, result: Any) -> None:
+    """Store ``result`` as the answer to ``query`` for later reruns."""
+    st.session_state[_PREFIX + slot] = (query, result)
@@ -0,0 +1,69 @@
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until the leader finishes; re-raise its error if it failed.
+
+        Raises TimeoutError if ``timeout`` seconds pass first.
+        """
+        if not self.done.wait(timeout):
+            raise TimeoutError("timed out waiting for the in-flight call")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one upstream call.
+
+    Thread-safe: Streamlit runs every session in its own thread, so the
+    first caller for a key becomes the leader and the others block until
+    it has a result to share.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.coalesced = 0
+
+    def acquire(self, key: str) -> Tuple[_Call, bool]:
+        """Join the in-flight call for key; returns (call, is_leader)."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                return call, False
+            call = _Call()
+            self._calls[key] = call
+            return call, True
+
+    def release(self, key: str, call: _Call, result=None, error: Optional[BaseException] = None) -> None:
+        """Publish the leader's outcome and wake up the waiters."""
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call.result = result
+        call.error = error
+        call.done.set()
+
+    def do(self, key: str, fn: Callable, timeout: Optional[float] = None):
+        """Run fn as leader, or wait up to ``timeout`` for the leader's result."""
+        call, leader = self.acquire(key)
+        if not leader:
+            return call.wait(timeout)
+        try:
+            result = fn()
+        except BaseException as e:
+            self.release(key, call, error=e)
+            raise
+        self.release(key, call, result=result)
+        return result
@@ -0,0 +1,159 @@
+"""Page stylesheets loaded from ``styles/*.css``.
+
+Each stylesheet is read and minified once per process. Streamlit drops
+any element a rerun does not emit again, so pages still inject their
+style on every rerun; ``inject`` keeps that payload small:
+
+* by default it sends the minified CSS inline;
+* after ``python -m utils.theme`` has written ``static/css/<name>.css``
+  it sends a one-line ``@import`` of that file instead, which the browser
+  caches (needs ``enableStaticServing`` in ``.streamlit/config.toml``).
+
+``python -m utils.theme --bundle-fonts`` also downloads the Google Fonts
+used by the pages into ``static/fonts`` so no page imports them remotely.
+"""
+import argparse
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Tuple
+
+import streamlit as st
+
+STYLES_DIR = "styles"
+STATIC_DIR = "static"
+
+# Streamlit serves ./static at app/static when enableStaticServing is on
+STATIC_URL = "app/static"
+
+FONTS_CSS = os.path.join(STATIC_DIR, "fonts", "fonts.css")
+
+GOOGLE_FONTS: Dict[str, str] = {
+    "Inter": "https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap",
+    "Poppins": "https://fonts.googleapis.com/css2?family=Poppins:wght@300;400;600;700&display=swap",
+}
+
+# Fonts each stylesheet expects to be loaded
+PAGE_FONTS: Dict[str, Tuple[str, ...]] = {
+    "home": ("Inter",),
+    "info": ("Inter",),
+    "about": ("Poppins",),
+    "diet": (),
+}
+
+
+def minify(css: str) -> str:
+    """Strip comments and redundant whitespace from a stylesheet."""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+def _font_imports(name: str, static_url: str) -> str:
+    fonts = PAGE_FONTS.get(name, ())
+    if not fonts:
+        return ""
+    if os.path.exists(FONTS_CSS):
+        return f"@import url('{static_url}/fonts/fonts.css');"
+    return "".join(f"@import url('{GOOGLE_FONTS[font]}');" for font in fonts)
+
+
+@lru_cache(maxsize=None)
+def stylesheet(name: str, static_url: str = STATIC_URL) -> str:
+    """Minified CSS for ``styles/<name>.css``, font imports first.
+
+    ``static_url`` is where bundled fonts are served from, relative to
+    the document that imports the stylesheet.
+    """
+    with open(os.path.join(STYLES_DIR, f"{name}.css"), encoding="utf-8") as f:
+        return _font_imports(name, static_url) + minify(f.read())
+
+
+def _static_path(name: str) -> str:
+    return os.path.join(STATIC_DIR, "css", f"{name}.css")
+
+
+@lru_cache(maxsize=None)
+def _style_tag(name: str) -> str:
+    source = os.path.join(STYLES_DIR, f"{name}.css")
+    built = _static_path(name)
+    try:
+        fresh = os.path.getmtime(built) >= os.path.getmtime(source)
+    except OSError:
+        fresh = False
+    if fresh:
+        return f"<style>@import url('{STATIC_URL}/css/{name}.css');</style>"
+    return f"<style>{stylesheet(name)}</style>"
+
+
+def inject(name: str) -> None:
+    """Emit the page's stylesheet (call once near the top of the page)."""
+    st.markdown(_style_tag(name), unsafe_allow_html=True)
+
+
+def build() -> Dict[str, int]:
+    """Write every minified stylesheet to static/css; returns bytes per sheet."""
+    os.makedirs(os.path.join(STATIC_DIR, "css"), exist_ok=True)
+    sizes = {}
+    for filename in sorted(os.listdir(STYLES_DIR)):
+        name, ext = os.path.splitext(filename)
+        if ext != ".css":
+            continue
+        # Imported from app/static/css, so bundled fonts are one level up
+        css = stylesheet(name, static_url="..")
+        with open(_static_path(name), "w", encoding="utf-8") as f:
+            f.write(css)
+        sizes[name] = len(css.encode("utf-8"))
+    return sizes
+
+
+def bundle_fonts() -> int:
+    """Download the Google Fonts into static/fonts; returns the file count."""
+    from utils.http_session import get_session
+
+    session = get_session()
+    # A modern user agent makes Google serve woff2 files
+    headers = {"User-Agent": "Mozilla/5.0 (X11; Linux x86_64) Chrome/120.0 Safari/537.36"}
+    font_dir = os.path.dirname(FONTS_CSS)
+    os.makedirs(font_dir, exist_ok=True)
+
+    sheets = []
+    count = 0
+    for family, url in GOOGLE_FONTS.items():
+        resp = session.get(url, headers=headers, timeout=30)
+        resp.raise_for_status()
+        css = resp.text
+        font_urls = dict.fromkeys(re.findall(r"url\((https://[^)]+)\)", css))
+        for i, font_url in enumerate(font_urls):
+            filename = f"{family.lower()}-{i}{os.path.splitext(font_url)[1]}"
+            font = session.get(font_url, timeout=30)
+            font.raise_for_status()
+            with open(os.path.join(font_dir, filename), "wb") as f:
+                f.write(font.content)
+            css = css.replace(font_url, filename)
+            count += 1
+        sheets.append(css)
+
+    with open(FONTS_CSS, "w", encoding="utf-8") as f:
+        f.write(minify("\n".join(sheets)))
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build minified page stylesheets.")
+    parser.add_argument(
+        "--bundle-fonts", action="store_true", help="download Google Fonts into static/fonts"
+    )
+    args = parser.parse_args()
+
+    if args.bundle_fonts:
+        print(f"Bundled {bundle_fonts()} font files into {os.path.dirname(FONTS_CSS)}")
+        stylesheet.cache_clear()
+    for name, size in build().items():
+        print(f"{_static_path(name)}: {size} bytes")
+
+
+if __name__ == "__main__":
+    main()